@@ -1,21 +1,23 @@
 #!/usr/bin/env python3
+import mmap
+import os
+import re
 import sys
 
+_LCOV_LINES_RE = re.compile(rb'^(L[FH]):[ \t]*(\d+)', re.MULTILINE)
+
 def parse_lcov(path: str) -> float:
     total = 0
     hit = 0
-    with open(path, 'r') as f:
-        for line in f:
-            if line.startswith('LF:'):
-                try:
-                    total += int(line.strip().split(':')[1])
-                except Exception:
-                    pass
-            elif line.startswith('LH:'):
-                try:
-                    hit += int(line.strip().split(':')[1])
-                except Exception:
-                    pass
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0.0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in _LCOV_LINES_RE.finditer(mm):
+                if m.group(1) == b'LF':
+                    total += int(m.group(2))
+                else:
+                    hit += int(m.group(2))
     if total == 0:
         return 0.0
     return 100.0 * hit / total
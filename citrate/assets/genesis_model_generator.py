@@ -11,6 +11,11 @@ from transformers import BertConfig, BertModel
 import onnx
 import onnxruntime as ort
 
+try:
+    import coremltools as ct
+except ImportError:
+    ct = None
+
 class TinyBERT(nn.Module):
     """Tiny BERT model optimized for on-chain operations"""
     
@@ -27,6 +32,7 @@ class TinyBERT(nn.Module):
             max_position_embeddings=512,
             type_vocab_size=2,
             layer_norm_eps=1e-12,
+            attn_implementation="sdpa",
         )
         
         # Initialize BERT model
@@ -50,6 +56,50 @@ class TinyBERT(nn.Module):
         
         return embeddings
 
+class TinyBERTNoTokenTypes(nn.Module):
+    """TinyBERT signature without token_type_ids, which are always zero"""
+    
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids, attention_mask)
+
+def export_coreml(model, input_ids, attention_mask):
+    """
+    Export FP16 CoreML packages: a flexible-shape one accepting any batch and
+    sequence length, and a fixed (1, 128) one the Neural Engine can run
+    """
+    
+    if ct is None:
+        print("coremltools not installed, skipping CoreML export")
+        return
+    
+    print("Exporting to CoreML...")
+    traced = torch.jit.trace(TinyBERTNoTokenTypes(model).eval(), (input_ids, attention_mask))
+    
+    exports = [
+        ("../assets/genesis_model.mlpackage",
+         (ct.RangeDim(1, 64, default=1), ct.RangeDim(1, 512, default=128))),
+        # The ANE only takes static shapes, anything flexible falls back to CPU/GPU
+        ("../assets/genesis_model_ane.mlpackage", (1, 128)),
+    ]
+    
+    for path, shape in exports:
+        # iOS18 lets the converter fuse attention into a single SDPA op
+        mlmodel = ct.convert(
+            traced,
+            inputs=[
+                ct.TensorType(name='input_ids', shape=shape, dtype=np.int32),
+                ct.TensorType(name='attention_mask', shape=shape, dtype=np.int32),
+            ],
+            outputs=[ct.TensorType(name='embeddings')],
+            compute_precision=ct.precision.FLOAT16,
+            minimum_deployment_target=ct.target.iOS18,
+        )
+        mlmodel.save(path)
+
 def create_genesis_model():
     """Create and export the genesis model"""
     
@@ -71,7 +121,7 @@ def create_genesis_model():
         (dummy_input_ids, dummy_attention_mask, dummy_token_type_ids),
         "../assets/genesis_model.onnx",
         export_params=True,
-        opset_version=13,
+        opset_version=17,
         do_constant_folding=True,
         input_names=['input_ids', 'attention_mask', 'token_type_ids'],
         output_names=['embeddings'],
@@ -83,14 +133,33 @@ def create_genesis_model():
         }
     )
     
+    export_coreml(model, dummy_input_ids, dummy_attention_mask)
+    
     # Verify the model
     print("Verifying ONNX model...")
     onnx_model = onnx.load("../assets/genesis_model.onnx")
     onnx.checker.check_model(onnx_model)
     
-    # Test inference
+    # Save the fully fused graph; EPs that compile nodes (CoreML) cannot be
+    # serialized, so this pass runs on CPU only
+    print("Optimizing ONNX graph...")
+    offline_options = ort.SessionOptions()
+    offline_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    offline_options.optimized_model_filepath = "../assets/genesis_model.opt.onnx"
+    ort.InferenceSession(
+        "../assets/genesis_model.onnx", offline_options, providers=["CPUExecutionProvider"]
+    )
+    
+    # Test inference on the CoreML EP where available, so unsupported ops show up here
     print("Testing inference...")
-    ort_session = ort.InferenceSession("../assets/genesis_model.onnx")
+    session_options = ort.SessionOptions()
+    session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    available = ort.get_available_providers()
+    providers = [p for p in ("CoreMLExecutionProvider", "CPUExecutionProvider") if p in available]
+    ort_session = ort.InferenceSession(
+        "../assets/genesis_model.onnx", session_options, providers=providers
+    )
+    print(f"Providers: {', '.join(ort_session.get_providers())}")
     
     outputs = ort_session.run(
         None,
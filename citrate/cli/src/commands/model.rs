@@ -7,7 +7,8 @@ use colored::Colorize;
 use serde_json::json;
 use sha3::Digest;
 use std::fs;
-use std::path::PathBuf;
+use std::io::Read;
+use std::path::{Path, PathBuf};
 use std::time::Duration;
 use tokio::time::sleep;
 
@@ -51,11 +52,11 @@ pub enum ModelCommands {
         #[arg(long)]
         model_id: String,
 
-        /// Input data file (JSON)
+        /// Input data file (JSON), or "-" to read from stdin
         #[arg(short, long)]
         input: PathBuf,
 
-        /// Output file path
+        /// Output file path, or "-" to write raw JSON to stdout
         #[arg(short, long)]
         output: Option<PathBuf>,
 
@@ -337,6 +338,11 @@ async fn deploy_model(
     Ok(())
 }
 
+/// Whether a path argument refers to stdin/stdout ("-")
+fn is_stdio_path(path: &Path) -> bool {
+    path.as_os_str() == "-"
+}
+
 async fn run_inference(
     config: &Config,
     model_id: &str,
@@ -344,11 +350,29 @@ async fn run_inference(
     output_path: Option<PathBuf>,
     with_proof: bool,
 ) -> Result<()> {
-    println!("{}", "Running inference...".cyan());
+    // With "--output -" stdout carries only the JSON result, so status goes to stderr
+    let output_to_stdout = output_path.as_deref().map_or(false, is_stdio_path);
+    let status = |msg: String| {
+        if output_to_stdout {
+            eprintln!("{}", msg);
+        } else {
+            println!("{}", msg);
+        }
+    };
+
+    status("Running inference...".cyan().to_string());
 
     // Read input data
-    let input_data = fs::read_to_string(&input_path)
-        .with_context(|| format!("Failed to read input file {:?}", input_path))?;
+    let input_data = if is_stdio_path(&input_path) {
+        let mut buf = String::new();
+        std::io::stdin()
+            .read_to_string(&mut buf)
+            .context("Failed to read input from stdin")?;
+        buf
+    } else {
+        fs::read_to_string(&input_path)
+            .with_context(|| format!("Failed to read input file {:?}", input_path))?
+    };
 
     let input_json: serde_json::Value =
         serde_json::from_str(&input_data).context("Invalid JSON input")?;
@@ -374,10 +398,12 @@ async fn run_inference(
     let result: serde_json::Value = response.json().await?;
 
     if let Some(output) = result["result"]["output"].as_object() {
-        println!("{}", "✓ Inference completed successfully".green());
+        status("✓ Inference completed successfully".green().to_string());
 
         // Save output if path specified
-        if let Some(path) = output_path {
+        if output_to_stdout {
+            println!("{}", serde_json::to_string(output)?);
+        } else if let Some(path) = output_path {
             let output_str = serde_json::to_string_pretty(output)?;
             fs::write(&path, output_str)
                 .with_context(|| format!("Failed to write output to {:?}", path))?;
@@ -389,12 +415,12 @@ async fn run_inference(
 
         if with_proof {
             if let Some(proof) = result["result"]["proof"].as_str() {
-                println!("\nProof ID: {}", proof.cyan());
+                status(format!("\nProof ID: {}", proof.cyan()));
             }
         }
 
         if let Some(exec_time) = result["result"]["execution_time_ms"].as_u64() {
-            println!("Execution time: {}ms", exec_time);
+            status(format!("Execution time: {}ms", exec_time));
         }
     } else if let Some(error) = result["error"].as_object() {
         anyhow::bail!(
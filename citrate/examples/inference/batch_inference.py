@@ -7,11 +7,14 @@ Demonstrates high-throughput processing with Metal GPU acceleration
 """
 
 import json
+import os
 import time
 import subprocess
-from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
+import requests
+
+RPC_URL = os.environ.get("CITRATE_RPC_URL", "http://localhost:8545")
+MICRO_BATCH_SIZE = 32
 
 def generate_batch_data(batch_size=100):
     """Generate batch of text samples for processing."""
@@ -33,10 +36,17 @@ def generate_batch_data(batch_size=100):
     levels = ["barely", "very", "extremely", "somewhat", "not"]
     supports = ["incredibly", "not", "somewhat", "very", "barely"]
 
-    batch = []
-    for i in range(batch_size):
-        template = templates[i % len(templates)]
-        text = template.format(
+    if batch_size <= 0:
+        return []
+
+    # Every list cycles with the item index, so the texts repeat with a
+    # period of the lcm of the list lengths; format each distinct text once
+    lengths = [len(templates), len(qualities), len(services), len(feelings),
+               len(tasks), len(impacts), len(levels), len(supports)]
+    period = min(int(np.lcm.reduce(lengths)), batch_size)
+
+    unique_texts = [
+        templates[i % len(templates)].format(
             quality=qualities[i % len(qualities)],
             service=services[i % len(services)],
             feeling=feelings[i % len(feelings)],
@@ -45,49 +55,69 @@ def generate_batch_data(batch_size=100):
             level=levels[i % len(levels)],
             support=supports[i % len(supports)]
         )
-        batch.append(text)
-
-    return batch
-
-def process_single_item(model_id, text, index):
-    """Process a single text item."""
-
-    input_data = {
-        "text": text,
-        "task": "sentiment-analysis"
-    }
-
-    input_file = Path(f"/tmp/batch_input_{index}.json")
-    output_file = Path(f"/tmp/batch_output_{index}.json")
+        for i in range(period)
+    ]
 
-    with open(input_file, "w") as f:
-        json.dump(input_data, f)
+    indices = np.arange(batch_size) % period
+    return [unique_texts[i] for i in indices.tolist()]
+
+def process_micro_batch(session, model_id, texts, offset):
+    """Process a micro-batch of texts with a single JSON-RPC batch request."""
+
+    payload = [
+        {
+            "jsonrpc": "2.0",
+            "method": "citrate_runInference",
+            "params": {
+                "model_id": model_id,
+                "input": {
+                    "text": text,
+                    "task": "sentiment-analysis"
+                }
+            },
+            "id": offset + i
+        }
+        for i, text in enumerate(texts)
+    ]
 
     start = time.time()
-    result = subprocess.run([
-        "./target/release/citrate-cli", "model", "inference",
-        "--model-id", model_id,
-        "--input", str(input_file),
-        "--output", str(output_file)
-    ], capture_output=True, text=True)
+    try:
+        response = session.post(RPC_URL, json=payload, timeout=60)
+        response.raise_for_status()
+        replies = response.json()
+    except (requests.RequestException, ValueError) as e:
+        duration = time.time() - start
+        return [{"success": False, "duration": duration, "error": str(e)} for _ in texts]
 
     duration = time.time() - start
 
-    if result.returncode == 0:
-        with open(output_file) as f:
-            output = json.load(f)
-        return {
-            "success": True,
-            "duration": duration,
-            "sentiment": output.get("label"),
-            "confidence": output.get("score")
-        }
-    else:
-        return {
-            "success": False,
-            "duration": duration,
-            "error": result.stderr
-        }
+    # A batch-level failure comes back as a single error object
+    if isinstance(replies, dict):
+        replies = [replies]
+
+    # Batch responses may come back in any order, match them up by id
+    replies_by_id = {reply.get("id"): reply for reply in replies}
+
+    results = []
+    for i in range(len(texts)):
+        reply = replies_by_id.get(offset + i, {})
+        output = (reply.get("result") or {}).get("output")
+        if isinstance(output, dict):
+            results.append({
+                "success": True,
+                "duration": duration,
+                "sentiment": output.get("label"),
+                "confidence": output.get("score")
+            })
+        else:
+            error = reply.get("error") or {}
+            results.append({
+                "success": False,
+                "duration": duration,
+                "error": error.get("message", "No inference output returned")
+            })
+
+    return results
 
 def run_batch_inference():
     """Run batch inference with performance metrics."""
@@ -120,31 +150,22 @@ def run_batch_inference():
     batch_data = generate_batch_data(batch_size)
     print()
 
-    # Process batch with parallel execution
+    # Process batch in micro-batches over a single persistent connection
     print(f"🚀 Processing batch with Metal GPU acceleration...")
     print("  • Using Neural Engine for models < 500MB")
-    print("  • Parallel execution with thread pool")
+    print(f"  • Micro-batches of {MICRO_BATCH_SIZE} per JSON-RPC request")
     print()
 
     start_time = time.time()
     results = []
 
-    # Use thread pool for parallel processing
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {
-            executor.submit(process_single_item, model_id, text, i): i
-            for i, text in enumerate(batch_data)
-        }
-
-        completed = 0
-        for future in as_completed(futures):
-            result = future.result()
-            results.append(result)
-            completed += 1
+    with requests.Session() as session:
+        for offset in range(0, batch_size, MICRO_BATCH_SIZE):
+            texts = batch_data[offset:offset + MICRO_BATCH_SIZE]
+            results.extend(process_micro_batch(session, model_id, texts, offset))
 
             # Progress indicator
-            if completed % 10 == 0:
-                print(f"  Processed {completed}/{batch_size} items...")
+            print(f"  Processed {len(results)}/{batch_size} items...")
 
     total_time = time.time() - start_time
 
@@ -152,12 +173,21 @@ def run_batch_inference():
     successful = [r for r in results if r["success"]]
     failed = [r for r in results if not r["success"]]
 
-    avg_latency = np.mean([r["duration"] for r in successful]) if successful else 0
-    min_latency = np.min([r["duration"] for r in successful]) if successful else 0
-    max_latency = np.max([r["duration"] for r in successful]) if successful else 0
-    p50_latency = np.percentile([r["duration"] for r in successful], 50) if successful else 0
-    p95_latency = np.percentile([r["duration"] for r in successful], 95) if successful else 0
-    p99_latency = np.percentile([r["duration"] for r in successful], 99) if successful else 0
+    if successful:
+        durations = np.fromiter(
+            (r["duration"] for r in successful), dtype=np.float64, count=len(successful)
+        )
+        avg_latency = durations.mean()
+        min_latency = durations.min()
+        max_latency = durations.max()
+
+        # Nearest-rank percentiles from a single O(n) partition
+        n = len(durations)
+        ranks = np.minimum(np.array([n // 2, int(n * 0.95), int(n * 0.99)]), n - 1)
+        p50_latency, p95_latency, p99_latency = np.partition(durations, ranks)[ranks]
+    else:
+        avg_latency = min_latency = max_latency = 0
+        p50_latency = p95_latency = p99_latency = 0
 
     throughput = len(successful) / total_time if total_time > 0 else 0
 
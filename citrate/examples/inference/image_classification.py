@@ -5,15 +5,40 @@ Demonstrates vision model inference with ResNet-50 on Metal GPU
 """
 
 import json
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import requests
 from io import BytesIO
+from requests.adapters import HTTPAdapter
+
+RPC_URL = os.environ.get("CITRATE_RPC_URL", "http://localhost:8545")
+MAX_BATCH_SIZE = 100
+
+# Keep-alive connections shared by image downloads and inference requests
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+def fetch_image(name, url):
+    """Download one image and save it resized for ResNet."""
+
+    response = session.get(url, timeout=10)
+    response.raise_for_status()
+    img = Image.open(BytesIO(response.content))
+    img = img.convert("RGB")  # Ensure RGB format
+    if img.size != (224, 224):  # ResNet input size
+        img = img.resize((224, 224), Image.Resampling.BILINEAR)
+
+    # Save locally, without chroma subsampling
+    img_path = Path(f"/tmp/{name}.jpg")
+    img.save(img_path, quality=90, subsampling=0)
+    return img_path
 
 def download_sample_images():
-    """Download sample images for testing."""
+    """Download sample images for testing, all at once."""
 
     sample_urls = {
         "cat": "https://upload.wikimedia.org/wikipedia/commons/thumb/3/3a/Cat03.jpg/300px-Cat03.jpg",
@@ -23,23 +48,56 @@ def download_sample_images():
     }
 
     images = {}
-    for name, url in sample_urls.items():
-        try:
-            response = requests.get(url)
-            img = Image.open(BytesIO(response.content))
-            img = img.convert("RGB")  # Ensure RGB format
-            img = img.resize((224, 224))  # ResNet input size
-
-            # Save locally
-            img_path = Path(f"/tmp/{name}.jpg")
-            img.save(img_path)
-            images[name] = img_path
-            print(f"  ✅ Downloaded {name} image")
-        except Exception as e:
-            print(f"  ❌ Failed to download {name}: {e}")
+    with ThreadPoolExecutor(max_workers=len(sample_urls)) as executor:
+        futures = {name: executor.submit(fetch_image, name, url)
+                   for name, url in sample_urls.items()}
+
+        for name, future in futures.items():
+            try:
+                images[name] = future.result()
+                print(f"  ✅ Downloaded {name} image")
+            except Exception as e:
+                print(f"  ❌ Failed to download {name}: {e}")
 
     return images
 
+def classify_images(model_id, inputs):
+    """Run inference for all inputs as JSON-RPC batches of up to MAX_BATCH_SIZE calls."""
+
+    outputs = []
+    for offset in range(0, len(inputs), MAX_BATCH_SIZE):
+        chunk = inputs[offset:offset + MAX_BATCH_SIZE]
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "method": "citrate_runInference",
+                "params": {"model_id": model_id, "input": input_data},
+                "id": offset + i
+            }
+            for i, input_data in enumerate(chunk)
+        ]
+
+        try:
+            response = session.post(RPC_URL, json=payload, timeout=60)
+            response.raise_for_status()
+            replies = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"❌ Inference request failed: {e}")
+            outputs.extend([None] * len(chunk))
+            continue
+
+        # A batch-level failure comes back as a single error object
+        if isinstance(replies, dict):
+            replies = [replies]
+
+        # Batch responses may come back in any order, match them up by id
+        replies_by_id = {reply.get("id"): reply for reply in replies}
+        for i in range(len(chunk)):
+            result = replies_by_id.get(offset + i, {}).get("result") or {}
+            outputs.append(result.get("output"))
+
+    return outputs
+
 def run_image_classification():
     """Run image classification on sample images."""
 
@@ -80,31 +138,19 @@ def run_image_classification():
     print("🧠 Running Image Classification:")
     print("-" * 40)
 
-    for name, img_path in images.items():
-        # Prepare input
-        input_data = {
+    inputs = [
+        {
             "image_path": str(img_path),
             "task": "image-classification",
             "top_k": 3  # Return top 3 predictions
         }
+        for img_path in images.values()
+    ]
 
-        # Save input to temp file
-        input_file = Path("/tmp/image_input.json")
-        with open(input_file, "w") as f:
-            json.dump(input_data, f)
-
-        # Run inference via CLI
-        result = subprocess.run([
-            "./target/release/citrate-cli", "model", "inference",
-            "--model-id", model_id,
-            "--input", str(input_file),
-            "--output", "/tmp/image_output.json"
-        ], capture_output=True, text=True)
-
-        if result.returncode == 0:
-            with open("/tmp/image_output.json") as f:
-                output = json.load(f)
+    outputs = classify_images(model_id, inputs)
 
+    for name, output in zip(images, outputs):
+        if isinstance(output, dict):
             print(f"\n🖼️  Image: {name}.jpg")
             print("   Predictions:")
 
@@ -4,11 +4,46 @@ Text Classification Example using Citrate AI Pipeline
 Demonstrates sentiment analysis with DistilBERT on Apple Silicon
 """
 
+import asyncio
 import json
+import os
 import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+from import_model import AsyncModelImporter
+
+RPC_URL = os.environ.get("CITRATE_RPC_URL", "http://localhost:8545")
+MAX_CONCURRENT_INFERENCES = 10
+
+async def classify_text(importer, model_id, text, semaphore):
+    """Run inference for one text, returning None on failure."""
+
+    input_data = {
+        "text": text,
+        "task": "sentiment-analysis"
+    }
+
+    async with semaphore:
+        try:
+            return await importer.infer(model_id, input_data)
+        except Exception as e:
+            print(f"❌ Inference request failed: {e}")
+            return None
+
+async def classify_texts(model_id, texts):
+    """Fan out inference RPCs on one event loop, bounded by a semaphore."""
+
+    importer = AsyncModelImporter(RPC_URL)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_INFERENCES)
+    try:
+        return await asyncio.gather(
+            *(classify_text(importer, model_id, text, semaphore) for text in texts)
+        )
+    finally:
+        await importer.aclose()
+
 def run_sentiment_analysis():
     """Run sentiment analysis on sample texts."""
 
@@ -48,30 +83,10 @@ def run_sentiment_analysis():
     print("🧠 Running Sentiment Analysis:")
     print("-" * 40)
 
-    for text in test_texts:
-        # Prepare input
-        input_data = {
-            "text": text,
-            "task": "sentiment-analysis"
-        }
-
-        # Save input to temp file
-        input_file = Path("/tmp/sentiment_input.json")
-        with open(input_file, "w") as f:
-            json.dump(input_data, f)
-
-        # Run inference via CLI
-        result = subprocess.run([
-            "./target/release/citrate-cli", "model", "inference",
-            "--model-id", model_id,
-            "--input", str(input_file),
-            "--output", "/tmp/sentiment_output.json"
-        ], capture_output=True, text=True)
-
-        if result.returncode == 0:
-            with open("/tmp/sentiment_output.json") as f:
-                output = json.load(f)
+    outputs = asyncio.run(classify_texts(model_id, test_texts))
 
+    for text, output in zip(test_texts, outputs):
+        if isinstance(output, dict):
             sentiment = output.get("label", "unknown")
             confidence = output.get("score", 0.0)
 
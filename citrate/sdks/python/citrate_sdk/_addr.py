@@ -0,0 +1,33 @@
+"""
+Address validation and normalization helpers for the Citrate SDK
+"""
+
+import functools
+import re
+
+from eth_utils import to_checksum_address
+
+from .errors import CitrateError
+
+_ADDR_RE = re.compile(r'^0x[0-9a-fA-F]{40}$')
+
+
+def is_address(address: str) -> bool:
+    """Check that a string is a 0x-prefixed 20-byte hex address"""
+    return isinstance(address, str) and _ADDR_RE.match(address) is not None
+
+
+@functools.lru_cache(maxsize=4096)
+def checksum(address: str) -> str:
+    """
+    Validate an address and return its EIP-55 checksum form.
+
+    Results are cached, so repeated lookups of the same address skip the
+    Keccak hash.
+
+    Raises:
+        CitrateError: If the address is malformed
+    """
+    if not is_address(address):
+        raise CitrateError(f"Invalid address: {address}")
+    return to_checksum_address(address)
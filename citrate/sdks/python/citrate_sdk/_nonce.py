@@ -0,0 +1,46 @@
+"""
+Client-side transaction nonce tracking for the Citrate SDK
+"""
+
+import threading
+from typing import Callable, Dict
+
+
+class NonceTracker:
+    """
+    Hands out sequential nonces per address without querying the node each time.
+
+    The first nonce for an address is fetched from the node; later ones are
+    incremented locally. Call reset() after a failed send so the next nonce is
+    fetched again.
+    """
+
+    __slots__ = ("_nonces", "_lock")
+
+    def __init__(self):
+        self._nonces: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next(self, address: str, fetch: Callable[[], int]) -> int:
+        """
+        Reserve the next nonce for an address.
+
+        Args:
+            address: Sender address
+            fetch: Returns the node's pending nonce; called only when none is tracked
+
+        Returns:
+            Nonce to use for the next transaction
+        """
+        key = address.lower()
+        with self._lock:
+            nonce = self._nonces.get(key)
+            if nonce is None:
+                nonce = fetch()
+            self._nonces[key] = nonce + 1
+            return nonce
+
+    def reset(self, address: str) -> None:
+        """Forget the tracked nonce so the next one is fetched from the node"""
+        with self._lock:
+            self._nonces.pop(address.lower(), None)
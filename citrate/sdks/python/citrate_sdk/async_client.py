@@ -0,0 +1,151 @@
+"""
+Async Citrate Client - asyncio interface for Citrate blockchain reads
+
+Requires the optional ``async`` extra (``pip install "citrate-sdk[async]"``).
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from .client import _hex_to_int, _unpack_batch
+from .errors import CitrateError
+
+# Connection limits for the pooled async HTTP client
+_MAX_CONNECTIONS = 64
+_MAX_KEEPALIVE_CONNECTIONS = 32
+
+
+class AsyncCitrateClient:
+    """
+    Asynchronous client for Citrate JSON-RPC.
+
+    All requests share one pooled keep-alive HTTP client, so many calls can
+    be awaited concurrently (e.g. with asyncio.gather) from a single event
+    loop without a thread per request.
+    """
+
+    def __init__(self, rpc_url: str = "http://localhost:8545",
+                 client: Optional["httpx.AsyncClient"] = None):
+        """
+        Initialize async Citrate client.
+
+        Args:
+            rpc_url: RPC endpoint URL
+            client: Shared httpx.AsyncClient, or None to create one
+        """
+        if httpx is None:
+            raise CitrateError("httpx is required for AsyncCitrateClient; "
+                               "install citrate-sdk[async]")
+
+        self.rpc_url = rpc_url.rstrip('/')
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=_MAX_CONNECTIONS,
+                                max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS),
+            headers={
+                'Content-Type': 'application/json',
+                'User-Agent': 'citrate-python-sdk/0.1.0'
+            },
+            timeout=30
+        )
+        self._request_id = 0
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client if this instance created it"""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def _next_request_id(self) -> int:
+        """Get next JSON-RPC request ID"""
+        self._request_id += 1
+        return self._request_id
+
+    async def _post(self, payload: Any) -> Any:
+        """POST a JSON-RPC payload and decode the response"""
+        try:
+            response = await self._client.post(self.rpc_url, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPError as e:
+            raise CitrateError(f"Network error: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise CitrateError(f"Invalid JSON response: {str(e)}")
+
+    async def _rpc_call_async(self, method: str, params: List[Any] = None) -> Any:
+        """
+        Make JSON-RPC call to Citrate node.
+
+        Args:
+            method: RPC method name
+            params: Method parameters
+
+        Returns:
+            RPC response result
+
+        Raises:
+            CitrateError: If RPC call fails
+        """
+        data = await self._post({
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": self._next_request_id()
+        })
+
+        if "error" in data:
+            raise CitrateError(f"RPC error: {data['error']['message']}")
+
+        return data.get("result")
+
+    async def _rpc_batch_async(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Make several JSON-RPC calls in a single batch request.
+
+        Args:
+            calls: List of (method, params) pairs
+
+        Returns:
+            RPC results in the same order as calls
+
+        Raises:
+            CitrateError: If the request fails or any call returns an error
+        """
+        if not calls:
+            return []
+
+        first_id = self._request_id + 1
+        self._request_id += len(calls)
+        data = await self._post([
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": first_id + i}
+            for i, (method, params) in enumerate(calls)
+        ])
+
+        return _unpack_batch(calls, first_id, data)
+
+    async def get_chain_id(self) -> int:
+        """Get blockchain chain ID"""
+        return _hex_to_int(await self._rpc_call_async("eth_chainId"))
+
+    async def get_block_number(self) -> int:
+        """Get latest block number"""
+        return _hex_to_int(await self._rpc_call_async("eth_blockNumber"))
+
+    async def get_balance(self, address: str) -> int:
+        """Get account balance in wei"""
+        return _hex_to_int(await self._rpc_call_async("eth_getBalance", [address, "latest"]))
+
+    async def get_nonce(self, address: str) -> int:
+        """Get account transaction nonce"""
+        return _hex_to_int(await self._rpc_call_async("eth_getTransactionCount", [address, "pending"]))
@@ -4,16 +4,118 @@ Citrate Client - Main SDK interface for Citrate blockchain interaction
 
 import json
 import requests
-from typing import Dict, Any, List, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import hashlib
+import math
 import time
 
 from .models import ModelConfig, ModelDeployment, InferenceRequest, InferenceResult
 from .crypto import EncryptionConfig, KeyManager
 from .errors import CitrateError, ModelNotFoundError, InsufficientFundsError
 from .ipfs import upload_to_ipfs
+from ._addr import checksum
+from ._cache import TTLCache
+from ._nonce import NonceTracker
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Seconds an RPC result may be reused, by method. Methods not listed are never cached.
+_RPC_CACHE_TTL = {
+    "eth_chainId": math.inf,
+    "eth_gasPrice": 1.0,
+}
+
+# Connection pool size for sessions created by the client; large enough that
+# threaded callers reuse sockets instead of opening and discarding extras
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 32
+
+# Methods that submit transactions; a gateway error may arrive after the node
+# accepted the transaction, so these are never resent on a 5xx status
+_WRITE_METHODS = frozenset(("eth_sendRawTransaction", "eth_sendTransaction"))
+
+# Block tags whose block changes over time; any other block number is immutable
+_MUTABLE_BLOCK_TAGS = frozenset(("latest", "pending", "safe", "finalized"))
+
+
+def _create_session(retry_status: bool = True) -> requests.Session:
+    """
+    Create a keep-alive session with a sized connection pool for the RPC endpoint
+
+    Args:
+        retry_status: Also resend requests that got a 502/503/504 response
+    """
+    session = requests.Session()
+
+    # Failed connections never reached the node, so any POST can be retried.
+    # Gateway failures are only retried when resending is safe, i.e. for
+    # idempotent JSON-RPC reads.
+    adapter = HTTPAdapter(
+        pool_connections=_POOL_CONNECTIONS,
+        pool_maxsize=_POOL_MAXSIZE,
+        max_retries=Retry(total=3, read=0, backoff_factor=0.1,
+                          status_forcelist=(502, 503, 504) if retry_status else (),
+                          allowed_methods=frozenset(("POST",)),
+                          raise_on_status=False)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a JSON-RPC payload, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits
+            pass
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _hex_to_int(value: Union[str, int]) -> int:
+    """Decode a JSON-RPC hex quantity, passing through values already decoded"""
+    # int(value, 16) accepts the 0x prefix and odd-length quantities such as
+    # "0x1", and benchmarks faster than int.from_bytes(bytes.fromhex(...))
+    return value if isinstance(value, int) else int(value, 16)
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so either parser
+# is handled by the same except clauses
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _unpack_batch(calls: List[Tuple[str, List[Any]]], first_id: int, data: Any) -> List[Any]:
+    """Match a JSON-RPC batch response to its calls by id, raising on any error"""
+    # A single object instead of a list means the batch itself was rejected
+    if isinstance(data, dict):
+        message = data.get("error", {}).get("message", "invalid batch response")
+        raise CitrateError(f"RPC error: {message}")
+
+    replies = {reply.get("id"): reply for reply in data}
+    results = []
+    errors = []
+    for i, (method, _) in enumerate(calls):
+        reply = replies.get(first_id + i)
+        if reply is None:
+            errors.append(f"{method}: missing response")
+        elif "error" in reply:
+            errors.append(f"{method}: {reply['error']['message']}")
+        else:
+            results.append(reply.get("result"))
+
+    if errors:
+        raise CitrateError(f"RPC error: {'; '.join(errors)}")
+
+    return results
 
 
 class CitrateClient:
@@ -27,23 +129,47 @@ class CitrateClient:
     - Payment and revenue sharing
     """
 
-    def __init__(self, rpc_url: str = "http://localhost:8545", private_key: Optional[str] = None):
+    def __init__(
+        self,
+        rpc_url: str = "http://localhost:8545",
+        private_key: Optional[str] = None,
+        session: Optional[requests.Session] = None
+    ):
         """
         Initialize Citrate client.
 
         Args:
             rpc_url: RPC endpoint URL
             private_key: Optional private key for transactions
+            session: Optional shared session, so several clients reuse one connection pool
         """
         self.rpc_url = rpc_url.rstrip('/')
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'citrate-python-sdk/0.1.0'
-        })
+        self.session = session or _create_session()
+        # Transactions go through a session that does not resend on gateway
+        # errors; a caller-provided session is used as configured
+        self._write_session = session or _create_session(retry_status=False)
+        for http_session in (self.session, self._write_session):
+            http_session.headers.update({
+                'Content-Type': 'application/json',
+                'User-Agent': 'citrate-python-sdk/0.1.0'
+            })
 
         self.key_manager = KeyManager(private_key) if private_key else None
         self._request_id = 0
+        self._rpc_cache = TTLCache()
+        self._nonces = NonceTracker()
+
+    def cache_clear(self) -> None:
+        """Drop all cached RPC results"""
+        self._rpc_cache.clear()
+
+    @staticmethod
+    def _rpc_cache_ttl(method: str, params: List[Any]) -> float:
+        """Get how long a result for this call may be reused (0 = never)"""
+        if method == "eth_getBlockByNumber":
+            # Blocks at a fixed height never change once produced
+            return 0.0 if not params or params[0] in _MUTABLE_BLOCK_TAGS else math.inf
+        return _RPC_CACHE_TTL.get(method, 0.0)
 
     def _next_request_id(self) -> int:
         """Get next JSON-RPC request ID"""
@@ -64,41 +190,92 @@ class CitrateClient:
         Raises:
             CitrateError: If RPC call fails
         """
+        params = params or []
+        ttl = self._rpc_cache_ttl(method, params)
+        if ttl:
+            cache_key = (method, json.dumps(params, sort_keys=True))
+            hit, result = self._rpc_cache.get(cache_key)
+            if hit:
+                return result
+
         payload = {
             "jsonrpc": "2.0",
             "method": method,
-            "params": params or [],
+            "params": params,
             "id": self._next_request_id()
         }
 
+        session = self._write_session if method in _WRITE_METHODS else self.session
+
         try:
-            response = self.session.post(self.rpc_url, json=payload, timeout=30)
+            response = session.post(self.rpc_url, data=_json_dumps(payload), timeout=30)
             response.raise_for_status()
 
-            data = response.json()
+            data = _json_loads(response.content)
             if "error" in data:
                 raise CitrateError(f"RPC error: {data['error']['message']}")
 
-            return data.get("result")
+            result = data.get("result")
+            # A null result (e.g. a block not yet produced) may change later
+            if ttl and result is not None:
+                self._rpc_cache.set(cache_key, result, ttl)
+
+            return result
+
+        except requests.exceptions.RequestException as e:
+            raise CitrateError(f"Network error: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise CitrateError(f"Invalid JSON response: {str(e)}")
+
+    def _rpc_batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Make several JSON-RPC calls in a single batch request.
+
+        Args:
+            calls: List of (method, params) pairs
+
+        Returns:
+            RPC results in the same order as calls
+
+        Raises:
+            CitrateError: If the request fails or any call returns an error
+        """
+        if not calls:
+            return []
+
+        first_id = self._request_id + 1
+        self._request_id += len(calls)
+        payload = [
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": first_id + i}
+            for i, (method, params) in enumerate(calls)
+        ]
+
+        try:
+            response = self.session.post(self.rpc_url, data=_json_dumps(payload), timeout=30)
+            response.raise_for_status()
+
+            data = _json_loads(response.content)
 
         except requests.exceptions.RequestException as e:
             raise CitrateError(f"Network error: {str(e)}")
         except json.JSONDecodeError as e:
             raise CitrateError(f"Invalid JSON response: {str(e)}")
 
+        return _unpack_batch(calls, first_id, data)
+
     def get_chain_id(self) -> int:
         """Get blockchain chain ID"""
-        return self._rpc_call("eth_chainId")
+        return _hex_to_int(self._rpc_call("eth_chainId"))
 
     def get_balance(self, address: str) -> int:
         """Get account balance in wei"""
-        result = self._rpc_call("eth_getBalance", [address, "latest"])
-        return int(result, 16)
+        result = self._rpc_call("eth_getBalance", [checksum(address), "latest"])
+        return _hex_to_int(result)
 
     def get_nonce(self, address: str) -> int:
         """Get account transaction nonce"""
-        result = self._rpc_call("eth_getTransactionCount", [address, "pending"])
-        return int(result, 16)
+        result = self._rpc_call("eth_getTransactionCount", [checksum(address), "pending"])
+        return _hex_to_int(result)
 
     def deploy_model(
         self,
@@ -161,7 +338,7 @@ class CitrateClient:
         tx_hash = self._send_transaction("0x0100000000000000000000000000000000000100", tx_data)
 
         # Wait for confirmation
-        receipt = self._wait_for_receipt(tx_hash)
+        receipt = self.wait_for_receipt(tx_hash)
 
         # Extract model ID from logs
         model_id = self._extract_model_id_from_receipt(receipt)
@@ -221,7 +398,7 @@ class CitrateClient:
         )
 
         # Wait for execution
-        receipt = self._wait_for_receipt(tx_hash)
+        receipt = self.wait_for_receipt(tx_hash)
 
         # Extract results from logs
         output_data = self._extract_inference_output(receipt)
@@ -234,7 +411,7 @@ class CitrateClient:
         return InferenceResult(
             model_id=model_id,
             output_data=output_data,
-            gas_used=receipt.get("gasUsed", 0),
+            gas_used=_hex_to_int(receipt.get("gasUsed", 0)),
             execution_time=receipt.get("executionTime", 0),
             tx_hash=tx_hash
         )
@@ -290,9 +467,9 @@ class CitrateClient:
         if not self.key_manager:
             raise CitrateError("Private key required for transactions")
 
-        # Get account info
+        # Get account info; the nonce is fetched once and then tracked locally
         from_address = self.key_manager.get_address()
-        nonce = self.get_nonce(from_address)
+        nonce = self._nonces.next(from_address, lambda: self.get_nonce(from_address))
 
         # Build transaction
         tx = {
@@ -305,17 +482,47 @@ class CitrateClient:
             "data": "0x" + json.dumps(data).encode().hex()
         }
 
-        # Sign transaction
-        signed_tx = self.key_manager.sign_transaction(tx)
+        try:
+            # Sign transaction
+            signed_tx = self.key_manager.sign_transaction(tx)
+
+            # Send raw transaction
+            return self._rpc_call("eth_sendRawTransaction", [signed_tx])
+        except CitrateError:
+            # The reserved nonce may not have been used; resync on the next send
+            self._nonces.reset(from_address)
+            raise
+
+    def wait_for_receipt(
+        self,
+        tx_hash: str,
+        timeout: float = 60,
+        poll_interval: float = 0.1,
+        max_poll_interval: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        Wait for a transaction to be mined and return its receipt.
+
+        Polls with exponential backoff, starting at poll_interval and doubling
+        up to max_poll_interval, so fast confirmations return quickly without
+        hammering the node on slow ones.
 
-        # Send raw transaction
-        return self._rpc_call("eth_sendRawTransaction", [signed_tx])
+        Args:
+            tx_hash: Transaction hash
+            timeout: Maximum time to wait in seconds
+            poll_interval: Initial delay between receipt queries
+            max_poll_interval: Upper bound for the delay between queries
 
-    def _wait_for_receipt(self, tx_hash: str, timeout: int = 60) -> Dict[str, Any]:
-        """Wait for transaction receipt"""
-        start_time = time.time()
+        Returns:
+            Transaction receipt
 
-        while time.time() - start_time < timeout:
+        Raises:
+            CitrateError: If no receipt is available before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        delay = poll_interval
+
+        while True:
             try:
                 receipt = self._rpc_call("eth_getTransactionReceipt", [tx_hash])
                 if receipt:
@@ -323,7 +530,12 @@ class CitrateClient:
             except CitrateError:
                 pass
 
-            time.sleep(1)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_poll_interval)
 
         raise CitrateError(f"Transaction timeout: {tx_hash}")
 
@@ -2,22 +2,54 @@
 Cryptographic utilities for Citrate SDK
 """
 
+import base64
 import hashlib
+import hmac
 import secrets
 import json
-from typing import Tuple, Dict, Any, List
+from pathlib import Path
+from typing import Tuple, Dict, Any, List, BinaryIO, Union
+from Crypto.Hash import keccak as _keccak
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.backends import default_backend
 from eth_account import Account
+from eth_account.messages import encode_defunct
 from eth_account.signers.local import LocalAccount
 
 from .errors import CitrateError
 from .finite_field import split_secret_bytes, reconstruct_secret_bytes
 from .ecdh_real import ECDHManager
 
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+_sha256 = hashlib.sha256
+
+# Buffers above this size are fed to the hash through a memoryview
+_LARGE_BUFFER_THRESHOLD = 1 << 20
+
+# encrypt_data packages start with a 12-byte nonce followed by the 32-byte key
+_DATA_PACKAGE_HEADER_SIZE = 12 + 32
+
+# Wrapped owner keys start with a 32-byte HKDF salt followed by a 12-byte nonce
+_KEY_PACKAGE_HEADER_SIZE = 32 + 12
+
+# Read buffer size for streaming model hashes
+_STREAM_CHUNK_SIZE = 1 << 20
+
+# Maximum number of HKDF-derived owner keys cached per KeyManager
+_OWNER_KEY_CACHE_SIZE = 128
+
+
+def _keccak256(data: bytes) -> bytes:
+    """Keccak-256 digest via pycryptodome's C implementation"""
+    return _keccak.new(digest_bits=256, data=data).digest()
+
 
 class KeyManager:
     """
@@ -30,6 +62,8 @@ class KeyManager:
     - Transaction signing
     """
 
+    __slots__ = ("account", "ecdh_manager", "_owner_salt", "_owner_keys", "_public_key_hex", "_signer")
+
     def __init__(self, private_key: str = None):
         """
         Initialize key manager.
@@ -37,25 +71,30 @@ class KeyManager:
         Args:
             private_key: Hex-encoded private key, or None to generate new key
         """
-        if private_key:
-            if private_key.startswith('0x'):
-                private_key = private_key[2:]
-            self.account: LocalAccount = Account.from_key(private_key)
-        else:
-            self.account: LocalAccount = Account.create()
-
-        # Generate ECDH key pair for model encryption
         private_key_bytes = None
         if private_key:
-            # Use Ethereum private key for ECDH as well
             if private_key.startswith('0x'):
                 private_key = private_key[2:]
             private_key_bytes = bytes.fromhex(private_key)
+            self.account: LocalAccount = Account.from_key(private_key_bytes)
+        else:
+            self.account: LocalAccount = Account.create()
 
+        # Generate ECDH key pair for model encryption, reusing the Ethereum key if given
         self.ecdh_manager = ECDHManager(private_key_bytes)
 
+        # Key wrapping reuses one salt per instance; derived keys are cached by salt
+        self._owner_salt = secrets.token_bytes(32)
+        self._owner_keys: Dict[bytes, bytes] = {}
+
+        # The key pair never changes, so the encoded public key is computed once
+        self._public_key_hex = None
+
+        # libsecp256k1 signing key for the Ethereum account, built on first use
+        self._signer = None
+
     def get_address(self) -> str:
-        """Get Ethereum address"""
+        """Get Ethereum address (derived once by eth_account when the key is loaded)"""
         return self.account.address
 
     def get_private_key(self) -> str:
@@ -64,8 +103,9 @@ class KeyManager:
 
     def get_public_key(self) -> str:
         """Get ECDH public key for sharing"""
-        public_bytes = self.ecdh_manager.get_public_key_compressed()
-        return public_bytes.hex()
+        if self._public_key_hex is None:
+            self._public_key_hex = self.ecdh_manager.get_public_key_compressed().hex()
+        return self._public_key_hex
 
     def sign_transaction(self, transaction: Dict[str, Any]) -> str:
         """
@@ -83,6 +123,33 @@ class KeyManager:
         except Exception as e:
             raise CitrateError(f"Transaction signing failed: {str(e)}")
 
+    def sign_message(self, message: bytes) -> str:
+        """
+        Sign a message with the Ethereum key (EIP-191 personal_sign).
+
+        Args:
+            message: Raw message bytes
+
+        Returns:
+            65-byte r || s || v signature as hex string
+        """
+        try:
+            if coincurve is None:
+                signed = self.account.sign_message(encode_defunct(primitive=message))
+                return "0x" + bytes(signed.signature).hex()
+
+            if self._signer is None:
+                self._signer = coincurve.PrivateKey(bytes(self.account.key))
+
+            digest = _keccak256(
+                b"\x19Ethereum Signed Message:\n" + str(len(message)).encode() + message
+            )
+            signature = bytearray(self._signer.sign_recoverable(digest, hasher=None))
+            signature[64] += 27  # recovery id -> Ethereum v
+            return "0x" + signature.hex()
+        except Exception as e:
+            raise CitrateError(f"Message signing failed: {str(e)}")
+
     def encrypt_model(
         self,
         model_data: bytes,
@@ -163,22 +230,25 @@ class KeyManager:
         aesgcm = AESGCM(key)
         ciphertext = aesgcm.encrypt(nonce, data_bytes, None)
 
-        # Package with key and nonce
-        package = {
-            "ciphertext": ciphertext.hex(),
-            "nonce": nonce.hex(),
-            "key": key.hex()
-        }
-
-        return json.dumps(package)
+        # Package as base64(nonce || key || ciphertext)
+        return base64.b64encode(nonce + key + ciphertext).decode('ascii')
 
     def decrypt_data(self, encrypted_package: str) -> str:
         """Decrypt string data from encrypt_data"""
         try:
-            package = json.loads(encrypted_package)
-            ciphertext = bytes.fromhex(package["ciphertext"])
-            nonce = bytes.fromhex(package["nonce"])
-            key = bytes.fromhex(package["key"])
+            if encrypted_package.startswith('{'):
+                # Legacy JSON package with hex-encoded fields
+                package = json.loads(encrypted_package)
+                ciphertext = bytes.fromhex(package["ciphertext"])
+                nonce = bytes.fromhex(package["nonce"])
+                key = bytes.fromhex(package["key"])
+            else:
+                blob = base64.b64decode(encrypted_package, validate=True)
+                if len(blob) < _DATA_PACKAGE_HEADER_SIZE:
+                    raise ValueError("Encrypted package too short")
+                nonce = blob[:12]
+                key = blob[12:_DATA_PACKAGE_HEADER_SIZE]
+                ciphertext = blob[_DATA_PACKAGE_HEADER_SIZE:]
 
             aesgcm = AESGCM(key)
             plaintext = aesgcm.decrypt(nonce, ciphertext, None)
@@ -209,45 +279,56 @@ class KeyManager:
         except Exception as e:
             raise CitrateError(f"Key derivation failed: {str(e)}")
 
+    def _derive_owner_key(self, salt: bytes) -> bytes:
+        """Derive the owner key-wrapping key for a salt, caching the result"""
+        owner_key = self._owner_keys.get(salt)
+        if owner_key is None:
+            hkdf = HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                info=b'citrate-key-wrapping',
+                backend=default_backend()
+            )
+            owner_key = hkdf.derive(self.account.key)
+
+            if len(self._owner_keys) >= _OWNER_KEY_CACHE_SIZE:
+                self._owner_keys.pop(next(iter(self._owner_keys)))
+            self._owner_keys[salt] = owner_key
+
+        return owner_key
+
     def _encrypt_key_for_owner(self, key: bytes) -> str:
         """Encrypt key for model owner using proper key wrapping"""
         # Use HKDF for proper key derivation from account key
-        salt = secrets.token_bytes(32)
-        hkdf = HKDF(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            info=b'citrate-key-wrapping',
-            backend=default_backend()
-        )
-        owner_key = hkdf.derive(self.account.key)
+        salt = self._owner_salt
+        owner_key = self._derive_owner_key(salt)
 
         nonce = secrets.token_bytes(12)
         aesgcm = AESGCM(owner_key)
         encrypted_key = aesgcm.encrypt(nonce, key, None)
 
-        return json.dumps({
-            "encrypted_key": encrypted_key.hex(),
-            "nonce": nonce.hex(),
-            "salt": salt.hex()
-        })
+        # Package as base64(salt || nonce || encrypted_key)
+        return base64.b64encode(salt + nonce + encrypted_key).decode('ascii')
 
     def _decrypt_key_from_owner(self, encrypted_key_package: str) -> bytes:
         """Decrypt key for model owner using proper key derivation"""
-        package = json.loads(encrypted_key_package)
-        encrypted_key = bytes.fromhex(package["encrypted_key"])
-        nonce = bytes.fromhex(package["nonce"])
-        salt = bytes.fromhex(package["salt"])
+        if encrypted_key_package.startswith('{'):
+            # Legacy JSON package with hex-encoded fields
+            package = json.loads(encrypted_key_package)
+            encrypted_key = bytes.fromhex(package["encrypted_key"])
+            nonce = bytes.fromhex(package["nonce"])
+            salt = bytes.fromhex(package["salt"])
+        else:
+            blob = base64.b64decode(encrypted_key_package, validate=True)
+            if len(blob) < _KEY_PACKAGE_HEADER_SIZE:
+                raise CitrateError("Encrypted key package too short")
+            salt = blob[:32]
+            nonce = blob[32:_KEY_PACKAGE_HEADER_SIZE]
+            encrypted_key = blob[_KEY_PACKAGE_HEADER_SIZE:]
 
         # Derive owner key using same HKDF parameters
-        hkdf = HKDF(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            info=b'citrate-key-wrapping',
-            backend=default_backend()
-        )
-        owner_key = hkdf.derive(self.account.key)
+        owner_key = self._derive_owner_key(salt)
 
         aesgcm = AESGCM(owner_key)
         return aesgcm.decrypt(nonce, encrypted_key, None)
@@ -256,15 +337,11 @@ class KeyManager:
         """Create Shamir's secret shares for key using proper finite field arithmetic"""
         shares_tuples = split_secret_bytes(key, threshold, total)
 
-        shares = []
-        for x, share_bytes in shares_tuples:
-            shares.append({
-                "x": str(x),
-                "y": share_bytes.hex(),
-                "threshold": str(threshold)
-            })
-
-        return shares
+        threshold_str = str(threshold)
+        return [
+            {"x": str(x), "y": share_bytes.hex(), "threshold": threshold_str}
+            for x, share_bytes in shares_tuples
+        ]
 
     def reconstruct_key_from_shares(self, shares: List[Dict[str, str]]) -> bytes:
         """Reconstruct key from Shamir's shares using proper Lagrange interpolation"""
@@ -288,6 +365,14 @@ class KeyManager:
 class EncryptionConfig:
     """Configuration for model encryption"""
 
+    __slots__ = (
+        "algorithm",
+        "key_derivation",
+        "access_control",
+        "threshold_shares",
+        "total_shares",
+    )
+
     def __init__(
         self,
         algorithm: str = "AES-256-GCM",
@@ -310,10 +395,69 @@ def generate_model_key() -> str:
 
 def hash_model_data(data: bytes) -> str:
     """Generate SHA-256 hash of model data"""
-    return hashlib.sha256(data).hexdigest()
+    if len(data) > _LARGE_BUFFER_THRESHOLD:
+        h = _sha256()
+        h.update(memoryview(data))
+        return h.hexdigest()
+    return _sha256(data).hexdigest()
+
+
+def hash_model_file(
+    source: Union[str, Path, BinaryIO],
+    chunk_size: int = _STREAM_CHUNK_SIZE
+) -> str:
+    """
+    Generate SHA-256 hash of a model file without loading it into memory.
+
+    Args:
+        source: Path to the model file, or a binary file object
+        chunk_size: Size of the reusable read buffer
+
+    Returns:
+        Hex-encoded SHA-256 digest, identical to hash_model_data on the content
+    """
+    h = _sha256()
+    buf = memoryview(bytearray(chunk_size))
+
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            _hash_file_into(h, f, buf)
+    else:
+        _hash_file_into(h, source, buf)
+
+    return h.hexdigest()
 
 
 def verify_model_integrity(data: bytes, expected_hash: str) -> bool:
     """Verify model data integrity against expected hash"""
     actual_hash = hash_model_data(data)
-    return actual_hash == expected_hash
\ No newline at end of file
+    return hmac.compare_digest(actual_hash.encode(), expected_hash.lower().encode())
+
+
+def verify_model_integrity_stream(
+    source: Union[str, Path, BinaryIO],
+    expected_hash: str,
+    chunk_size: int = _STREAM_CHUNK_SIZE
+) -> bool:
+    """
+    Verify model integrity by hashing a file incrementally.
+
+    Args:
+        source: Path to the model file, or a binary file object
+        expected_hash: Expected hex-encoded SHA-256 digest
+        chunk_size: Size of the reusable read buffer
+
+    Returns:
+        True if the file content matches the expected hash
+    """
+    actual_hash = hash_model_file(source, chunk_size)
+    return hmac.compare_digest(actual_hash.encode(), expected_hash.lower().encode())
+
+
+def _hash_file_into(h: Any, f: BinaryIO, buf: memoryview) -> None:
+    """Feed a binary file into a hash object through a reusable buffer"""
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        h.update(buf[:n])
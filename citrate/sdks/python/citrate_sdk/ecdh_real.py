@@ -2,18 +2,26 @@
 Real ECDH implementation using proper elliptic curve cryptography
 """
 
+from typing import Tuple
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.backends import default_backend
 from .errors import CitrateError
 
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
 
 class ECDHManager:
     """
     Real ECDH key exchange using secp256k1 elliptic curve
     """
 
+    __slots__ = ("_sk_bytes", "_private_key", "_public_key", "_cc")
+
     def __init__(self, private_key_bytes: bytes = None):
         """
         Initialize ECDH manager
@@ -21,19 +29,45 @@ class ECDHManager:
         Args:
             private_key_bytes: Optional 32-byte private key, generates new if None
         """
+        self._private_key = None
+        self._public_key = None
+
         if private_key_bytes:
             # Load existing private key
             if len(private_key_bytes) != 32:
                 raise CitrateError("Private key must be 32 bytes")
 
-            # Convert bytes to EC private key
-            private_value = int.from_bytes(private_key_bytes, 'big')
-            self.private_key = ec.derive_private_key(private_value, ec.SECP256K1(), default_backend())
+            self._sk_bytes = bytes(private_key_bytes)
+            self._cc = coincurve.PrivateKey(self._sk_bytes) if coincurve else None
+        elif coincurve is not None:
+            # Generate new private key with libsecp256k1
+            self._cc = coincurve.PrivateKey()
+            self._sk_bytes = self._cc.secret
         else:
             # Generate new private key
-            self.private_key = ec.generate_private_key(ec.SECP256K1(), default_backend())
-
-        self.public_key = self.private_key.public_key()
+            self._cc = None
+            self._private_key = ec.generate_private_key(ec.SECP256K1(), default_backend())
+            self._sk_bytes = self._private_key.private_numbers().private_value.to_bytes(32, 'big')
+
+        # Without libsecp256k1 the OpenSSL key is needed for everything, so
+        # build (and validate) it now; otherwise it is built on first use
+        if self._cc is None:
+            self.private_key
+
+    @property
+    def private_key(self) -> ec.EllipticCurvePrivateKey:
+        """OpenSSL private key object, built on first use"""
+        if self._private_key is None:
+            private_value = int.from_bytes(self._sk_bytes, 'big')
+            self._private_key = ec.derive_private_key(private_value, ec.SECP256K1(), default_backend())
+        return self._private_key
+
+    @property
+    def public_key(self) -> ec.EllipticCurvePublicKey:
+        """OpenSSL public key object, built on first use"""
+        if self._public_key is None:
+            self._public_key = self.private_key.public_key()
+        return self._public_key
 
     def get_private_key_bytes(self) -> bytes:
         """
@@ -42,8 +76,7 @@ class ECDHManager:
         Returns:
             Private key bytes
         """
-        private_value = self.private_key.private_numbers().private_value
-        return private_value.to_bytes(32, 'big')
+        return self._sk_bytes
 
     def get_public_key_compressed(self) -> bytes:
         """
@@ -52,6 +85,9 @@ class ECDHManager:
         Returns:
             Compressed public key bytes
         """
+        if self._cc is not None:
+            return self._cc.public_key.format(compressed=True)[1:]
+
         return self.public_key.public_numbers().x.to_bytes(32, 'big')
 
     def get_public_key_uncompressed(self) -> bytes:
@@ -61,10 +97,15 @@ class ECDHManager:
         Returns:
             Uncompressed public key bytes
         """
+        if self._cc is not None:
+            return self._cc.public_key.format(compressed=False)
+
         public_numbers = self.public_key.public_numbers()
-        x_bytes = public_numbers.x.to_bytes(32, 'big')
-        y_bytes = public_numbers.y.to_bytes(32, 'big')
-        return b'\x04' + x_bytes + y_bytes
+        buf = bytearray(65)
+        buf[0] = 0x04
+        buf[1:33] = public_numbers.x.to_bytes(32, 'big')
+        buf[33:] = public_numbers.y.to_bytes(32, 'big')
+        return bytes(buf)
 
     def perform_ecdh(self, peer_public_key_bytes: bytes) -> bytes:
         """
@@ -80,34 +121,17 @@ class ECDHManager:
             CitrateError: If ECDH fails
         """
         try:
+            if self._cc is not None:
+                return self._perform_ecdh_secp256k1(peer_public_key_bytes)
+
             # Parse peer public key based on length
-            if len(peer_public_key_bytes) == 32:
-                # Compressed x-coordinate only
-                x = int.from_bytes(peer_public_key_bytes, 'big')
-                y = self._recover_y_coordinate(x)
-                peer_public_numbers = ec.EllipticCurvePublicNumbers(x, y, ec.SECP256K1())
-
-            elif len(peer_public_key_bytes) == 33:
-                # Compressed format with prefix
-                if peer_public_key_bytes[0] not in [0x02, 0x03]:
-                    raise CitrateError("Invalid compressed public key prefix")
-
-                x = int.from_bytes(peer_public_key_bytes[1:], 'big')
-                y = self._recover_y_coordinate(x, peer_public_key_bytes[0] == 0x03)
-                peer_public_numbers = ec.EllipticCurvePublicNumbers(x, y, ec.SECP256K1())
-
-            elif len(peer_public_key_bytes) == 65:
-                # Uncompressed format
-                if peer_public_key_bytes[0] != 0x04:
-                    raise CitrateError("Invalid uncompressed public key prefix")
-
-                x = int.from_bytes(peer_public_key_bytes[1:33], 'big')
-                y = int.from_bytes(peer_public_key_bytes[33:65], 'big')
-                peer_public_numbers = ec.EllipticCurvePublicNumbers(x, y, ec.SECP256K1())
-
-            else:
+            parser = self._PEER_KEY_PARSERS.get(len(peer_public_key_bytes))
+            if parser is None:
                 raise CitrateError(f"Invalid public key length: {len(peer_public_key_bytes)}")
 
+            x, y = parser(self, peer_public_key_bytes)
+            peer_public_numbers = ec.EllipticCurvePublicNumbers(x, y, ec.SECP256K1())
+
             # Create public key object
             peer_public_key = peer_public_numbers.public_key(default_backend())
 
@@ -119,6 +143,25 @@ class ECDHManager:
         except Exception as e:
             raise CitrateError(f"ECDH key exchange failed: {str(e)}")
 
+    def _perform_ecdh_secp256k1(self, peer_public_key_bytes: bytes) -> bytes:
+        """
+        Perform ECDH through libsecp256k1 (coincurve)
+
+        Args:
+            peer_public_key_bytes: Peer's public key (32 or 33 or 65 bytes)
+
+        Returns:
+            32-byte shared secret (x coordinate of the shared point)
+        """
+        if len(peer_public_key_bytes) == 32:
+            # Bare x-coordinate, even y like _recover_y_coordinate's default
+            peer_public_key_bytes = b'\x02' + peer_public_key_bytes
+
+        peer_public_key = coincurve.PublicKey(peer_public_key_bytes)
+        shared_point = peer_public_key.multiply(self._cc.secret)
+
+        return shared_point.format(compressed=True)[1:]
+
     def derive_shared_secret(self, peer_public_key_bytes: bytes,
                            salt: bytes = b"citrate-ecdh",
                            info: bytes = b"shared-secret") -> bytes:
@@ -147,6 +190,34 @@ class ECDHManager:
 
         return hkdf.derive(shared_key)
 
+    def _parse_x_only(self, key_bytes: bytes) -> Tuple[int, int]:
+        """Parse a bare 32-byte x coordinate (even y)"""
+        x = int.from_bytes(key_bytes, 'big')
+        return x, self._recover_y_coordinate(x)
+
+    def _parse_compressed(self, key_bytes: bytes) -> Tuple[int, int]:
+        """Parse a 33-byte SEC1 compressed point"""
+        prefix = key_bytes[0]
+        if prefix != 0x02 and prefix != 0x03:
+            raise CitrateError("Invalid compressed public key prefix")
+
+        x = int.from_bytes(key_bytes[1:], 'big')
+        return x, self._recover_y_coordinate(x, prefix == 0x03)
+
+    def _parse_uncompressed(self, key_bytes: bytes) -> Tuple[int, int]:
+        """Parse a 65-byte SEC1 uncompressed point"""
+        if key_bytes[0] != 0x04:
+            raise CitrateError("Invalid uncompressed public key prefix")
+
+        return int.from_bytes(key_bytes[1:33], 'big'), int.from_bytes(key_bytes[33:], 'big')
+
+    # Public key parsers keyed by encoded length
+    _PEER_KEY_PARSERS = {
+        32: _parse_x_only,
+        33: _parse_compressed,
+        65: _parse_uncompressed,
+    }
+
     def _recover_y_coordinate(self, x: int, is_odd: bool = False) -> int:
         """
         Recover y coordinate from x coordinate for secp256k1 curve
@@ -215,15 +286,12 @@ class ECDHManager:
         """
         try:
             # Parse public key
-            if len(public_key_bytes) == 33:
-                x = int.from_bytes(public_key_bytes[1:], 'big')
-                y = self._recover_y_coordinate(x, public_key_bytes[0] == 0x03)
-            elif len(public_key_bytes) == 65:
-                x = int.from_bytes(public_key_bytes[1:33], 'big')
-                y = int.from_bytes(public_key_bytes[33:65], 'big')
-            else:
+            parser = self._PEER_KEY_PARSERS.get(len(public_key_bytes))
+            if parser is None or len(public_key_bytes) == 32:
                 return False
 
+            x, y = parser(self, public_key_bytes)
+
             public_numbers = ec.EllipticCurvePublicNumbers(x, y, ec.SECP256K1())
             public_key = public_numbers.public_key(default_backend())
 
@@ -6,6 +6,8 @@ Exception classes for Citrate SDK
 class CitrateError(Exception):
     """Base exception for Citrate SDK errors"""
 
+    __slots__ = ("error_code", "details")
+
     def __init__(self, message: str, error_code: str = None, details: dict = None):
         super().__init__(message)
         self.error_code = error_code
@@ -14,64 +16,59 @@ class CitrateError(Exception):
 
 class NetworkError(CitrateError):
     """Network communication errors"""
-    pass
+    __slots__ = ()
 
 
 class AuthenticationError(CitrateError):
     """Authentication and authorization errors"""
-    pass
+    __slots__ = ()
 
 
 class ModelNotFoundError(CitrateError):
     """Model not found or doesn't exist"""
-    pass
+    __slots__ = ()
 
 
 class InsufficientFundsError(CitrateError):
     """Insufficient funds for operation"""
-    pass
+    __slots__ = ()
 
 
 class ModelDeploymentError(CitrateError):
     """Model deployment failed"""
-    pass
+    __slots__ = ()
 
 
 class InferenceError(CitrateError):
     """Inference execution failed"""
-    pass
+    __slots__ = ()
 
 
 class EncryptionError(CitrateError):
     """Encryption/decryption failed"""
-    pass
+    __slots__ = ()
 
 
 class ValidationError(CitrateError):
     """Input validation failed"""
-    pass
+    __slots__ = ()
 
 
 class TimeoutError(CitrateError):
     """Operation timed out"""
-    pass
+    __slots__ = ()
 
 
 class ConfigurationError(CitrateError):
     """SDK configuration error"""
-    pass
+    __slots__ = ()
 
 
 class IPFSError(CitrateError):
     """IPFS storage error"""
-    pass
+    __slots__ = ()
 
 
 class ContractError(CitrateError):
     """Smart contract execution error"""
-    pass
-
-
-class IPFSError(CitrateError):
-    """IPFS storage error"""
-    pass
\ No newline at end of file
+    __slots__ = ()
@@ -3,9 +3,11 @@ Finite field arithmetic for Shamir's Secret Sharing
 Using GF(2^8) for byte-oriented operations
 """
 
-import random
+import secrets
 from typing import List, Tuple
 
+import numpy as np
+
 
 class GF256:
     """
@@ -16,6 +18,8 @@ class GF256:
     # Precomputed tables for efficiency
     _exp_table = None
     _log_table = None
+    _exp_array = None
+    _log_array = None
     _initialized = False
 
     @classmethod
@@ -39,6 +43,10 @@ class GF256:
             cls._exp_table[i] = cls._exp_table[i - 255]
 
         cls._log_table[0] = 0  # Special case
+
+        # NumPy copies for vectorised operations over whole byte arrays
+        cls._exp_array = np.array(cls._exp_table, dtype=np.uint8)
+        cls._log_array = np.array(cls._log_table, dtype=np.intp)
         cls._initialized = True
 
     @classmethod
@@ -74,6 +82,18 @@ class GF256:
 
         return cls._exp_table[cls._log_table[a] + cls._log_table[b]]
 
+    @classmethod
+    def multiply_array(cls, a: np.ndarray, b: int) -> np.ndarray:
+        """Multiply every element of a uint8 array by b in GF(2^8)"""
+        cls._initialize_tables()
+
+        if b == 0:
+            return np.zeros_like(a)
+
+        product = cls._exp_array[cls._log_array[a] + cls._log_table[b]]
+        product[a == 0] = 0
+        return product
+
     @classmethod
     def divide(cls, a: int, b: int) -> int:
         """Division in GF(2^8)"""
@@ -140,13 +160,19 @@ class ShamirSecretSharing:
         Returns:
             List of (x, share_bytes) tuples
         """
-        shares = []
-
-        for i in range(1, self.total_shares + 1):
-            share_bytes = self._evaluate_polynomial_at_point(secret, i)
-            shares.append((i, share_bytes))
-
-        return shares
+        # One random polynomial per secret byte, shared by every share:
+        # f(x) = a0 + a1*x + ... + a(k-1)*x^(k-1), where row 0 holds the secret bytes
+        secret_length = len(secret)
+        coefficients = np.empty((self.threshold, secret_length), dtype=np.uint8)
+        coefficients[0] = np.frombuffer(secret, dtype=np.uint8)
+        coefficients[1:] = np.frombuffer(
+            secrets.token_bytes((self.threshold - 1) * secret_length), dtype=np.uint8
+        ).reshape(self.threshold - 1, secret_length)
+
+        return [
+            (x, self._evaluate_polynomial_at_point(coefficients, x).tobytes())
+            for x in range(1, self.total_shares + 1)
+        ]
 
     def reconstruct_secret(self, shares: List[Tuple[int, bytes]]) -> bytes:
         """
@@ -181,33 +207,23 @@ class ShamirSecretSharing:
 
         return bytes(secret_bytes)
 
-    def _evaluate_polynomial_at_point(self, secret: bytes, x: int) -> bytes:
-        """
-        Evaluate polynomial at point x for each byte of the secret
+    def _evaluate_polynomial_at_point(self, coefficients: np.ndarray, x: int) -> np.ndarray:
         """
-        # Generate random coefficients for polynomial
-        # f(x) = a0 + a1*x + a2*x^2 + ... + a(k-1)*x^(k-1)
-        # where a0 is the secret byte and k is the threshold
-
-        share_bytes = []
+        Evaluate the per-byte polynomials at point x using Horner's rule
 
-        for secret_byte in secret:
-            # Generate random coefficients (except a0 which is the secret)
-            coefficients = [secret_byte]
-            for _ in range(1, self.threshold):
-                coefficients.append(random.randint(0, 255))
-
-            # Evaluate polynomial at x
-            result = 0
-            x_power = 1
+        Args:
+            coefficients: (threshold, secret_length) uint8 array, lowest degree first
+            x: Point to evaluate at
 
-            for coeff in coefficients:
-                result = GF256.add(result, GF256.multiply(coeff, x_power))
-                x_power = GF256.multiply(x_power, x)
+        Returns:
+            uint8 array with f(x) for each secret byte
+        """
+        result = np.zeros(coefficients.shape[1], dtype=np.uint8)
 
-            share_bytes.append(result)
+        for row in coefficients[::-1]:
+            result = GF256.multiply_array(result, x) ^ row
 
-        return bytes(share_bytes)
+        return result
 
     def _lagrange_interpolation(self, points: List[Tuple[int, int]], x: int) -> int:
         """
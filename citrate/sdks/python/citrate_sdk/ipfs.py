@@ -2,37 +2,159 @@
 Real IPFS integration for Citrate Python SDK
 """
 
+import base64
+import io
 import requests
 import json
 import hashlib
-from typing import Optional, Dict, Any
+import secrets
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Optional, Dict, Any, BinaryIO, Callable, Iterator, Tuple, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .errors import CitrateError, IPFSError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so either parser
+# is handled by the same except clauses
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Uploads are streamed to the IPFS API in chunks of this size
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Downloads are read from the IPFS API in chunks of this size
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Connection pool sizing for the IPFS HTTP API
+_POOL_CONNECTIONS = 4
+_POOL_MAXSIZE = 32
+
+# Leaf block size for client-side chunked uploads (the IPFS default)
+_BLOCK_SIZE = 256 * 1024
+
+# Maximum links per intermediate DAG node, matching the IPFS balanced layout
+_MAX_DAG_LINKS = 174
+
+# Number of content digest -> CID entries remembered per client
+_UPLOADED_CID_CACHE_SIZE = 1024
+
+# Uploads up to this size may be sent to several nodes when hedging
+_HEDGE_UPLOAD_MAX_BYTES = 4 << 20
+
+# Default size budget for the in-process CID -> bytes cache
+_DEFAULT_CACHE_MAX_BYTES = 256 << 20
+
+# How long a single node's /version probe result is reused (seconds)
+_STATUS_TTL = 5.0
+
+# How long a node health result is trusted before probing again (seconds)
+_HEALTH_TTL = 30.0
+
+# Upper bound for the backoff applied to a failing node (seconds)
+_MAX_HEALTH_BACKOFF = 300.0
+
+
+def _create_session(pool_connections: int = _POOL_CONNECTIONS) -> requests.Session:
+    """Create a keep-alive session with a sized connection pool for the IPFS API"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'citrate-python-sdk/0.1.0',
+        'Connection': 'keep-alive'
+    })
+
+    # Upload bodies are streamed and cannot be replayed, so only retry
+    # failures that happen before the request is sent
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=_POOL_MAXSIZE,
+        max_retries=Retry(total=3, connect=3, read=0, status=0,
+                          backoff_factor=0.2)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 
 class IPFSClient:
     """
     Real IPFS client for uploading and retrieving model data
     """
 
-    def __init__(self, api_url: str = "http://localhost:5001"):
+    def __init__(self, api_url: str = "http://localhost:5001",
+                 session: Optional[requests.Session] = None):
         """
         Initialize IPFS client
 
         Args:
             api_url: IPFS API endpoint URL
+            session: Shared session to send requests through, or None to create one
         """
         self.api_url = api_url.rstrip('/')
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'citrate-python-sdk/0.1.0'
-        })
+        self._owns_session = session is None
+        self.session = session or _create_session()
+
+        # (expires_at, alive, version) from the last /version probe
+        self._status_cache: Optional[Tuple[float, bool, Optional[str]]] = None
+
+        # CIDs of content this client has already added (and pinned), by SHA-256
+        self._uploaded: "OrderedDict[bytes, str]" = OrderedDict()
 
-    def upload_bytes(self, data: bytes) -> str:
+    def close(self) -> None:
+        """Close pooled connections to the IPFS node if this client owns the session"""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def upload_bytes(self, data: bytes, verify: bool = False) -> str:
         """
         Upload bytes to IPFS and return the hash
 
+        Content this client has already added is not sent again.
+
         Args:
             data: Bytes to upload
+            verify: Confirm the upload with an extra object/stat request
+
+        Returns:
+            IPFS hash (CID)
+
+        Raises:
+            IPFSError: If upload fails
+        """
+        # Identical content always has the same CID, so skip re-adding it
+        digest = hashlib.sha256(data).digest()
+        ipfs_hash = self._uploaded.get(digest)
+        if ipfs_hash is not None:
+            self._uploaded.move_to_end(digest)
+            return ipfs_hash
+
+        ipfs_hash = self.upload_stream(io.BytesIO(data), verify=verify)
+
+        self._uploaded[digest] = ipfs_hash
+        if len(self._uploaded) > _UPLOADED_CID_CACHE_SIZE:
+            self._uploaded.popitem(last=False)
+
+        return ipfs_hash
+
+    def upload_file(self, path: Union[str, Path], verify: bool = False) -> str:
+        """
+        Upload a file to IPFS without reading it into memory
+
+        Args:
+            path: Path to the file to upload
+            verify: Confirm the upload with an extra object/stat request
 
         Returns:
             IPFS hash (CID)
@@ -41,23 +163,48 @@ class IPFSClient:
             IPFSError: If upload fails
         """
         try:
-            # Use IPFS HTTP API to add file
-            files = {'file': ('model_data', data, 'application/octet-stream')}
+            with open(path, 'rb') as f:
+                return self.upload_stream(f, verify=verify)
+        except OSError as e:
+            raise IPFSError(f"Cannot read file for IPFS upload: {str(e)}")
+
+    def upload_stream(self, fileobj: BinaryIO, verify: bool = False) -> str:
+        """
+        Upload a binary file object to IPFS as a chunked multipart stream
+
+        The CID returned by a successful pinned add is computed from the
+        content by the node, so no follow-up request is needed unless
+        verify is set.
+
+        Args:
+            fileobj: Readable binary file object
+            verify: Confirm the upload with an extra object/stat request
 
+        Returns:
+            IPFS hash (CID)
+
+        Raises:
+            IPFSError: If upload fails
+        """
+        boundary = secrets.token_hex(16)
+
+        try:
+            # Use IPFS HTTP API to add file, streaming the multipart body
             response = self.session.post(
                 f"{self.api_url}/api/v0/add",
-                files=files,
+                data=self._multipart_body(fileobj, boundary),
+                headers={'Content-Type': f'multipart/form-data; boundary={boundary}'},
                 params={'pin': 'true', 'wrap-with-directory': 'false'}
             )
 
             if response.status_code != 200:
                 raise IPFSError(f"IPFS upload failed: HTTP {response.status_code}")
 
-            result = response.json()
+            result = _json_loads(response.content)
             ipfs_hash = result['Hash']
 
-            # Verify the upload by getting file info
-            self._verify_upload(ipfs_hash)
+            if verify:
+                self._verify_upload(ipfs_hash)
 
             return ipfs_hash
 
@@ -68,6 +215,168 @@ class IPFSClient:
         except KeyError as e:
             raise IPFSError(f"Missing field in IPFS response: {str(e)}")
 
+    def upload_large(self, source: Union[bytes, str, Path, BinaryIO],
+                     chunk_size: int = _BLOCK_SIZE, parallelism: int = 8) -> str:
+        """
+        Upload large content as raw blocks in parallel and link them into a file DAG
+
+        The content is split into chunk_size raw leaf blocks which are sent
+        with concurrent block/put requests. The leaves are then assembled
+        into a balanced UnixFS file DAG with dag/put, whose root is pinned.
+
+        Args:
+            source: Bytes, a file path, or a readable binary file object
+            chunk_size: Size of each leaf block
+            parallelism: Maximum number of concurrent block uploads
+
+        Returns:
+            Root IPFS hash (CIDv1)
+
+        Raises:
+            IPFSError: If upload fails
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return self._upload_blocks(io.BytesIO(source), chunk_size, parallelism)
+
+        if isinstance(source, (str, Path)):
+            try:
+                with open(source, 'rb') as f:
+                    return self._upload_blocks(f, chunk_size, parallelism)
+            except OSError as e:
+                raise IPFSError(f"Cannot read file for IPFS upload: {str(e)}")
+
+        return self._upload_blocks(source, chunk_size, parallelism)
+
+    def _upload_blocks(self, fileobj: BinaryIO, chunk_size: int, parallelism: int) -> str:
+        """Upload fileobj as raw leaf blocks and return the root CID"""
+        try:
+            root = self._build_dag(fileobj, chunk_size, parallelism)
+        except KeyError as e:
+            raise IPFSError(f"Missing field in IPFS response: {str(e)}")
+
+        if not self.pin_file(root):
+            raise IPFSError(f"Failed to pin uploaded DAG: {root}")
+
+        return root
+
+    def _build_dag(self, fileobj: BinaryIO, chunk_size: int, parallelism: int) -> str:
+        """Store the leaves and intermediate nodes of a file DAG, returning its root"""
+        # (cid, file bytes, cumulative DAG size) per leaf, in file order
+        leaves = []
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            while True:
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    break
+
+                # Bound read-ahead so memory stays at about 2 * parallelism chunks
+                if len(in_flight) >= 2 * parallelism:
+                    leaves.append(in_flight.popleft().result())
+                in_flight.append(executor.submit(self._put_block, chunk))
+
+            while in_flight:
+                leaves.append(in_flight.popleft().result())
+
+        if not leaves:
+            return self._put_file_node([])[0]
+
+        # Build the balanced DAG bottom-up until a single root remains
+        nodes = leaves
+        while len(nodes) > 1:
+            nodes = [
+                self._put_file_node(nodes[i:i + _MAX_DAG_LINKS])
+                for i in range(0, len(nodes), _MAX_DAG_LINKS)
+            ]
+
+        return nodes[0][0]
+
+    def _put_block(self, chunk: bytes) -> Tuple[str, int, int]:
+        """Store one raw leaf block and return (cid, size, size)"""
+        result = self._post_json(
+            "block/put",
+            files={'file': chunk},
+            params={'cid-codec': 'raw', 'mhtype': 'sha2-256'}
+        )
+        return result['Key'], len(chunk), len(chunk)
+
+    def _put_file_node(self, children: list) -> Tuple[str, int, int]:
+        """Store a UnixFS file node linking children and return (cid, filesize, dag size)"""
+        filesize = sum(size for _, size, _ in children)
+        dag_size = sum(tsize for _, _, tsize in children)
+
+        node = {
+            "Data": {"/": {"bytes": base64.b64encode(
+                self._unixfs_file_data(filesize, [size for _, size, _ in children])
+            ).decode().rstrip('=')}},
+            "Links": [
+                {"Hash": {"/": cid}, "Name": "", "Tsize": tsize}
+                for cid, _, tsize in children
+            ]
+        }
+
+        result = self._post_json(
+            "dag/put",
+            files={'file': json.dumps(node).encode()},
+            params={'store-codec': 'dag-pb', 'input-codec': 'dag-json'}
+        )
+        return result['Cid']['/'], filesize, dag_size
+
+    @staticmethod
+    def _unixfs_file_data(filesize: int, blocksizes: list) -> bytes:
+        """Encode a UnixFS Data protobuf for a file node"""
+        def varint(n: int) -> bytes:
+            out = bytearray()
+            while n > 0x7F:
+                out.append((n & 0x7F) | 0x80)
+                n >>= 7
+            out.append(n)
+            return bytes(out)
+
+        # Type = File (field 1), filesize (field 3), blocksizes (field 4, repeated)
+        data = b'\x08\x02' + b'\x18' + varint(filesize)
+        return data + b''.join(b'\x20' + varint(size) for size in blocksizes)
+
+    def _post_json(self, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """POST to an IPFS API endpoint and decode the JSON response"""
+        try:
+            response = self.session.post(f"{self.api_url}/api/v0/{endpoint}", **kwargs)
+
+            if response.status_code != 200:
+                raise IPFSError(f"IPFS {endpoint} failed: HTTP {response.status_code}")
+
+            return _json_loads(response.content)
+
+        except requests.exceptions.RequestException as e:
+            raise IPFSError(f"IPFS connection error: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise IPFSError(f"Invalid IPFS response: {str(e)}")
+
+    @staticmethod
+    def _multipart_body(fileobj: BinaryIO, boundary: str,
+                        chunk_size: int = _UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield a multipart/form-data body for fileobj, one chunk at a time
+
+        The file is read into a single reusable buffer, so memory use stays
+        at chunk_size regardless of the file size.
+        """
+        yield (
+            f'--{boundary}\r\n'
+            'Content-Disposition: form-data; name="file"; filename="model_data"\r\n'
+            'Content-Type: application/octet-stream\r\n\r\n'
+        ).encode()
+
+        buf = memoryview(bytearray(chunk_size))
+        while True:
+            n = fileobj.readinto(buf)
+            if not n:
+                break
+            yield buf[:n]
+
+        yield f'\r\n--{boundary}--\r\n'.encode()
+
     def download_bytes(self, ipfs_hash: str) -> bytes:
         """
         Download bytes from IPFS using hash
@@ -78,22 +387,75 @@ class IPFSClient:
         Returns:
             Downloaded bytes
 
+        Raises:
+            IPFSError: If download fails
+        """
+        data = bytearray()
+        for chunk in self.iter_download(ipfs_hash):
+            data += chunk
+
+        return bytes(data)
+
+    def download_to_file(self, ipfs_hash: str, dst_path: Union[str, Path],
+                         chunk_size: int = _DOWNLOAD_CHUNK_SIZE) -> None:
+        """
+        Download a file from IPFS straight to disk
+
+        Args:
+            ipfs_hash: IPFS hash (CID)
+            dst_path: Destination file path
+            chunk_size: Size of chunks read from the response
+
+        Raises:
+            IPFSError: If download fails
+        """
+        dst_path = Path(dst_path)
+
+        try:
+            with open(dst_path, 'wb') as f:
+                for chunk in self.iter_download(ipfs_hash, chunk_size):
+                    f.write(chunk)
+        except OSError as e:
+            dst_path.unlink(missing_ok=True)
+            raise IPFSError(f"Cannot write IPFS download: {str(e)}")
+        except IPFSError:
+            dst_path.unlink(missing_ok=True)
+            raise
+
+    def iter_download(self, ipfs_hash: str,
+                      chunk_size: int = _DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream a file from IPFS in chunks
+
+        Args:
+            ipfs_hash: IPFS hash (CID)
+            chunk_size: Size of chunks read from the response
+
+        Yields:
+            Chunks of the file content
+
         Raises:
             IPFSError: If download fails
         """
         try:
             response = self.session.post(
                 f"{self.api_url}/api/v0/cat",
-                params={'arg': ipfs_hash}
+                params={'arg': ipfs_hash},
+                stream=True
             )
+        except requests.exceptions.RequestException as e:
+            raise IPFSError(f"IPFS connection error: {str(e)}")
 
+        try:
             if response.status_code != 200:
                 raise IPFSError(f"IPFS download failed: HTTP {response.status_code}")
 
-            return response.content
+            yield from response.iter_content(chunk_size)
 
         except requests.exceptions.RequestException as e:
             raise IPFSError(f"IPFS connection error: {str(e)}")
+        finally:
+            response.close()
 
     def get_file_info(self, ipfs_hash: str) -> Dict[str, Any]:
         """
@@ -114,7 +476,7 @@ class IPFSClient:
             if response.status_code != 200:
                 raise IPFSError(f"IPFS stat failed: HTTP {response.status_code}")
 
-            return response.json()
+            return _json_loads(response.content)
 
         except requests.exceptions.RequestException as e:
             raise IPFSError(f"IPFS connection error: {str(e)}")
@@ -149,15 +511,7 @@ class IPFSClient:
         Returns:
             True if IPFS node is reachable
         """
-        try:
-            response = self.session.post(
-                f"{self.api_url}/api/v0/version",
-                timeout=5
-            )
-            return response.status_code == 200
-
-        except requests.exceptions.RequestException:
-            return False
+        return self._status()[0]
 
     def get_version(self) -> Optional[str]:
         """
@@ -166,6 +520,20 @@ class IPFSClient:
         Returns:
             Version string or None if unavailable
         """
+        return self._status()[1]
+
+    def _status(self) -> Tuple[bool, Optional[str]]:
+        """
+        Probe the node once for reachability and version
+
+        The result is memoized for a few seconds so is_available and
+        get_version share a single /version request.
+        """
+        cached = self._status_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1], cached[2]
+
+        alive, version = False, None
         try:
             response = self.session.post(
                 f"{self.api_url}/api/v0/version",
@@ -173,13 +541,14 @@ class IPFSClient:
             )
 
             if response.status_code == 200:
-                result = response.json()
-                return result.get('Version')
+                alive = True
+                version = _json_loads(response.content).get('Version')
 
-        except (requests.exceptions.RequestException, json.JSONDecodeError):
+        except (requests.exceptions.RequestException, ValueError):
             pass
 
-        return None
+        self._status_cache = (time.monotonic() + _STATUS_TTL, alive, version)
+        return alive, version
 
     def _verify_upload(self, ipfs_hash: str) -> None:
         """
@@ -200,28 +569,58 @@ class IPFSClient:
             raise IPFSError(f"File verification failed: {str(e)}")
 
 
+class _NodeUnavailable(IPFSError):
+    """Raised internally when a node is skipped because it is unhealthy"""
+    pass
+
+
 class IPFSManager:
     """
     High-level IPFS manager with fallback mechanisms
     """
 
     def __init__(self, primary_url: str = "http://localhost:5001",
-                 fallback_urls: Optional[list] = None):
+                 fallback_urls: Optional[list] = None,
+                 hedge_delay_ms: int = 200,
+                 cache_max_bytes: int = _DEFAULT_CACHE_MAX_BYTES):
         """
         Initialize IPFS manager with primary and fallback nodes
 
         Args:
             primary_url: Primary IPFS node URL
             fallback_urls: List of fallback IPFS node URLs
+            hedge_delay_ms: Delay before sending a hedged request to the next node
+            cache_max_bytes: Size budget for caching downloaded content (0 disables)
         """
-        self.primary = IPFSClient(primary_url)
-        self.fallbacks = [IPFSClient(url) for url in (fallback_urls or [])]
+        fallback_urls = fallback_urls or []
+
+        # One connection pool per node host, shared by every client
+        self.session = _create_session(max(_POOL_CONNECTIONS, 1 + len(fallback_urls)))
+        self.primary = IPFSClient(primary_url, session=self.session)
+        self.fallbacks = [IPFSClient(url, session=self.session) for url in fallback_urls]
         self.active_client = None
+        self.hedge_delay = hedge_delay_ms / 1000.0
+
+        # Per-client (alive, expires_at, consecutive_failures) health cache
+        self._health: Dict[IPFSClient, Tuple[bool, float, int]] = {}
+
+        # CIDs are immutable, so downloaded content can be reused as-is
+        self.cache_max_bytes = cache_max_bytes
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+
+        # Background pins to secondary nodes, started lazily on first upload
+        self._replication_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_replications: list = []
 
     def upload(self, data: bytes) -> str:
         """
         Upload data with automatic fallback
 
+        Small payloads are hedged: if a node has not answered within the
+        hedge delay the next node is tried in parallel. Large payloads are
+        uploaded to one node at a time to avoid sending them twice.
+
         Args:
             data: Bytes to upload
 
@@ -232,32 +631,27 @@ class IPFSManager:
             IPFSError: If all nodes fail
         """
         clients = [self.primary] + self.fallbacks
-        last_error = None
 
-        for client in clients:
-            try:
-                if client.is_available():
-                    ipfs_hash = client.upload_bytes(data)
-                    self.active_client = client
+        if len(data) <= _HEDGE_UPLOAD_MAX_BYTES:
+            client, ipfs_hash = self._hedged(clients, lambda c: c.upload_bytes(data))
+        else:
+            client, ipfs_hash = self._sequential(clients, lambda c: c.upload_bytes(data))
 
-                    # Try to pin on other available nodes for redundancy
-                    self._replicate_to_other_nodes(ipfs_hash, clients, client)
+        self.active_client = client
 
-                    return ipfs_hash
+        # Try to pin on other available nodes for redundancy
+        self._replicate_to_other_nodes(ipfs_hash, clients, client)
 
-            except IPFSError as e:
-                last_error = e
-                continue
-
-        if last_error:
-            raise last_error
-        else:
-            raise IPFSError("No IPFS nodes available")
+        return ipfs_hash
 
     def download(self, ipfs_hash: str) -> bytes:
         """
         Download data with automatic fallback
 
+        Nodes are hedged: if a node has not answered within the hedge delay
+        the next node is tried in parallel and the first success wins.
+        Content is cached by CID, so repeated downloads are served locally.
+
         Args:
             ipfs_hash: IPFS hash to download
 
@@ -267,25 +661,127 @@ class IPFSManager:
         Raises:
             IPFSError: If all nodes fail
         """
+        data = self._cache.get(ipfs_hash)
+        if data is not None:
+            self._cache.move_to_end(ipfs_hash)
+            return data
+
         clients = [self.primary] + self.fallbacks
-        last_error = None
 
         # Try active client first if available
-        if self.active_client:
-            try:
-                return self.active_client.download_bytes(ipfs_hash)
-            except IPFSError:
-                pass
+        if self.active_client in clients:
+            clients.remove(self.active_client)
+            clients.insert(0, self.active_client)
+
+        _, data = self._hedged(clients, lambda c: c.download_bytes(ipfs_hash))
+        self._cache_put(ipfs_hash, data)
+        return data
+
+    def _cache_put(self, ipfs_hash: str, data: bytes) -> None:
+        """Add content to the CID cache, evicting least recently used entries"""
+        if len(data) > self.cache_max_bytes:
+            return
+
+        self._cache[ipfs_hash] = data
+        self._cache_bytes += len(data)
+
+        while self._cache_bytes > self.cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    def wait_for_replication(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until background replication to secondary nodes has finished
+
+        Args:
+            timeout: Maximum time to wait in seconds
+        """
+        if self._pending_replications:
+            wait(self._pending_replications, timeout=timeout)
+        self._pending_replications = [f for f in self._pending_replications if not f.done()]
+
+    def close(self) -> None:
+        """Finish pending replication and close connections to all IPFS nodes"""
+        if self._replication_executor is not None:
+            self._replication_executor.shutdown(wait=True)
+            self._replication_executor = None
+            self._pending_replications = []
+
+        self.session.close()
+
+    def _attempt(self, client: IPFSClient,
+                 operation: Callable[[IPFSClient], Any]) -> Tuple[IPFSClient, Any]:
+        """Run an operation against one node, updating its health state"""
+        if not self._is_available(client):
+            raise _NodeUnavailable("IPFS node unavailable")
+
+        try:
+            result = operation(client)
+        except IPFSError:
+            self._record_failure(client)
+            raise
+
+        self._record_success(client)
+        return client, result
+
+    def _sequential(self, clients: list,
+                    operation: Callable[[IPFSClient], Any]) -> Tuple[IPFSClient, Any]:
+        """Try an operation on each node in turn until one succeeds"""
+        last_error = None
 
-        # Try all clients
         for client in clients:
             try:
-                if client.is_available():
-                    return client.download_bytes(ipfs_hash)
-
+                return self._attempt(client, operation)
+            except _NodeUnavailable:
+                continue
             except IPFSError as e:
                 last_error = e
-                continue
+
+        if last_error:
+            raise last_error
+        else:
+            raise IPFSError("No IPFS nodes available")
+
+    def _hedged(self, clients: list,
+                operation: Callable[[IPFSClient], Any]) -> Tuple[IPFSClient, Any]:
+        """
+        Run an operation with hedged requests across nodes
+
+        The first node is tried immediately; each time the hedge delay passes
+        without a result (or an attempt fails) the next node is started as
+        well. The first successful result is returned.
+        """
+        if len(clients) == 1:
+            return self._sequential(clients, operation)
+
+        last_error = None
+        remaining = list(clients)
+        pending = set()
+        executor = ThreadPoolExecutor(max_workers=len(clients))
+
+        try:
+            while remaining or pending:
+                if remaining:
+                    pending.add(executor.submit(self._attempt, remaining.pop(0), operation))
+
+                done, pending = wait(
+                    pending,
+                    timeout=self.hedge_delay if remaining else None,
+                    return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+                    try:
+                        return future.result()
+                    except _NodeUnavailable:
+                        continue
+                    except IPFSError as e:
+                        last_error = e
+        finally:
+            # Losing attempts are left to finish in the background
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
 
         if last_error:
             raise last_error
@@ -296,14 +792,66 @@ class IPFSManager:
                                  exclude_client: IPFSClient) -> None:
         """
         Replicate file to other available nodes for redundancy
+
+        Pins are sent in the background so the upload returns as soon as the
+        first node has the content.
+        """
+        others = [client for client in all_clients if client != exclude_client]
+        if not others:
+            return
+
+        if self._replication_executor is None:
+            self._replication_executor = ThreadPoolExecutor(
+                max_workers=max(len(all_clients), 1),
+                thread_name_prefix='ipfs-replicate'
+            )
+
+        # Reap finished replications so the list does not grow unbounded
+        self._pending_replications = [f for f in self._pending_replications if not f.done()]
+        self._pending_replications.extend(
+            self._replication_executor.submit(self._pin_on, client, ipfs_hash)
+            for client in others
+        )
+
+    def _pin_on(self, client: IPFSClient, ipfs_hash: str) -> None:
+        """Pin content on one secondary node, ignoring failures"""
+        if not self._is_available(client):
+            return
+
+        try:
+            if not client.pin_file(ipfs_hash):
+                self._record_failure(client)
+        except IPFSError:
+            # Ignore errors for replication
+            self._record_failure(client)
+
+    def _is_available(self, client: IPFSClient) -> bool:
+        """
+        Check node availability through the health cache
+
+        A cached result is reused until it expires; failing nodes stay
+        skipped (circuit open) for an exponentially growing backoff.
         """
-        for client in all_clients:
-            if client != exclude_client and client.is_available():
-                try:
-                    client.pin_file(ipfs_hash)
-                except IPFSError:
-                    # Ignore errors for replication
-                    pass
+        alive, expires_at, _ = self._health.get(client, (False, 0.0, 0))
+        if time.monotonic() < expires_at:
+            return alive
+
+        if client.is_available():
+            self._record_success(client)
+            return True
+
+        self._record_failure(client)
+        return False
+
+    def _record_success(self, client: IPFSClient) -> None:
+        """Mark a node healthy and close its circuit"""
+        self._health[client] = (True, time.monotonic() + _HEALTH_TTL, 0)
+
+    def _record_failure(self, client: IPFSClient) -> None:
+        """Mark a node unhealthy and back off before probing it again"""
+        failures = self._health.get(client, (False, 0.0, 0))[2] + 1
+        backoff = min(_HEALTH_TTL * 2 ** (failures - 1), _MAX_HEALTH_BACKOFF)
+        self._health[client] = (False, time.monotonic() + backoff, failures)
 
 
 # Global IPFS manager instance
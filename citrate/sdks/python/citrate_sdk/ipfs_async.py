@@ -0,0 +1,374 @@
+"""
+Asynchronous IPFS integration for Citrate Python SDK
+
+Requires the optional ``async`` extra (``pip install "citrate-sdk[async]"``).
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any, Awaitable, Callable, Tuple
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+from .errors import IPFSError
+from .ipfs import (_DEFAULT_CACHE_MAX_BYTES, _HEALTH_TTL, _HEDGE_UPLOAD_MAX_BYTES,
+                   _MAX_HEALTH_BACKOFF)
+
+# Connection limits for the shared async HTTP client
+_MAX_CONNECTIONS = 32
+_MAX_KEEPALIVE_CONNECTIONS = 16
+
+
+class AsyncIPFSClient:
+    """
+    Asynchronous IPFS client for uploading and retrieving model data
+    """
+
+    def __init__(self, api_url: str = "http://localhost:5001",
+                 client: Optional["httpx.AsyncClient"] = None):
+        """
+        Initialize async IPFS client
+
+        Args:
+            api_url: IPFS API endpoint URL
+            client: Shared httpx.AsyncClient, or None to create one
+        """
+        if httpx is None:
+            raise IPFSError("httpx is required for async IPFS support; "
+                            "install citrate-sdk[async]")
+
+        self.api_url = api_url.rstrip('/')
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=_MAX_CONNECTIONS,
+                                max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS),
+            headers={'User-Agent': 'citrate-python-sdk/0.1.0'},
+            timeout=None
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client if this instance created it"""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def upload_bytes(self, data: bytes) -> str:
+        """
+        Upload bytes to IPFS and return the hash
+
+        Args:
+            data: Bytes to upload
+
+        Returns:
+            IPFS hash (CID)
+
+        Raises:
+            IPFSError: If upload fails
+        """
+        try:
+            response = await self.client.post(
+                f"{self.api_url}/api/v0/add",
+                files={'file': data},
+                params={'pin': 'true', 'wrap-with-directory': 'false'}
+            )
+
+            if response.status_code != 200:
+                raise IPFSError(f"IPFS upload failed: HTTP {response.status_code}")
+
+            return response.json()['Hash']
+
+        except httpx.HTTPError as e:
+            raise IPFSError(f"IPFS connection error: {str(e)}")
+        except ValueError as e:
+            raise IPFSError(f"Invalid IPFS response: {str(e)}")
+
+    async def download_bytes(self, ipfs_hash: str) -> bytes:
+        """
+        Download bytes from IPFS
+
+        Args:
+            ipfs_hash: IPFS hash (CID) to download
+
+        Returns:
+            Downloaded bytes
+
+        Raises:
+            IPFSError: If download fails
+        """
+        try:
+            response = await self.client.post(
+                f"{self.api_url}/api/v0/cat",
+                params={'arg': ipfs_hash}
+            )
+
+            if response.status_code != 200:
+                raise IPFSError(f"IPFS download failed: HTTP {response.status_code}")
+
+            return response.content
+
+        except httpx.HTTPError as e:
+            raise IPFSError(f"IPFS connection error: {str(e)}")
+
+    async def pin_file(self, ipfs_hash: str) -> bool:
+        """
+        Pin file in IPFS to prevent garbage collection
+
+        Args:
+            ipfs_hash: IPFS hash (CID)
+
+        Returns:
+            True if pinning successful
+        """
+        try:
+            response = await self.client.post(
+                f"{self.api_url}/api/v0/pin/add",
+                params={'arg': ipfs_hash}
+            )
+            return response.status_code == 200
+
+        except httpx.HTTPError:
+            return False
+
+    async def is_available(self) -> bool:
+        """
+        Check if IPFS node is available
+
+        Returns:
+            True if IPFS node is reachable
+        """
+        try:
+            response = await self.client.post(f"{self.api_url}/api/v0/version", timeout=5)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+
+class AsyncIPFSManager:
+    """
+    Asynchronous IPFS manager with hedged requests across nodes
+    """
+
+    def __init__(self, primary_url: str = "http://localhost:5001",
+                 fallback_urls: Optional[list] = None,
+                 hedge_delay_ms: int = 200,
+                 cache_max_bytes: int = _DEFAULT_CACHE_MAX_BYTES):
+        """
+        Initialize async IPFS manager with primary and fallback nodes
+
+        All nodes share one HTTP client, so connections are pooled (and
+        multiplexed over HTTP/2 when available) across them.
+
+        Args:
+            primary_url: Primary IPFS node URL
+            fallback_urls: List of fallback IPFS node URLs
+            hedge_delay_ms: Delay before sending a hedged request to the next node
+            cache_max_bytes: Size budget for caching downloaded content (0 disables)
+        """
+        primary = AsyncIPFSClient(primary_url)
+        self.primary = primary
+        self.fallbacks = [AsyncIPFSClient(url, client=primary.client)
+                          for url in (fallback_urls or [])]
+        self.hedge_delay = hedge_delay_ms / 1000.0
+
+        # Per-client (alive, expires_at, consecutive_failures) health cache
+        self._health: Dict[AsyncIPFSClient, Tuple[bool, float, int]] = {}
+
+        # CIDs are immutable, so downloaded content can be reused as-is
+        self.cache_max_bytes = cache_max_bytes
+        self._cache: Dict[str, bytes] = {}
+        self._cache_bytes = 0
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client"""
+        await self.primary.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def upload(self, data: bytes) -> str:
+        """
+        Upload data and pin it on the other nodes concurrently
+
+        Small payloads are hedged across nodes. Large payloads are uploaded
+        to one node at a time to avoid sending them twice.
+
+        Args:
+            data: Bytes to upload
+
+        Returns:
+            IPFS hash
+
+        Raises:
+            IPFSError: If all nodes fail
+        """
+        clients = [self.primary] + self.fallbacks
+        if len(data) <= _HEDGE_UPLOAD_MAX_BYTES:
+            client, ipfs_hash = await self._hedged(clients, lambda c: c.upload_bytes(data))
+        else:
+            client, ipfs_hash = await self._sequential(clients, lambda c: c.upload_bytes(data))
+
+        await asyncio.gather(*(
+            self._pin_on(other, ipfs_hash) for other in clients if other is not client
+        ))
+
+        return ipfs_hash
+
+    async def download(self, ipfs_hash: str) -> bytes:
+        """
+        Download data, hedging across nodes
+
+        Args:
+            ipfs_hash: IPFS hash to download
+
+        Returns:
+            Downloaded bytes
+
+        Raises:
+            IPFSError: If all nodes fail
+        """
+        data = self._cache.pop(ipfs_hash, None)
+        if data is not None:
+            # Re-insert to mark as most recently used
+            self._cache[ipfs_hash] = data
+            return data
+
+        clients = [self.primary] + self.fallbacks
+        _, data = await self._hedged(clients, lambda c: c.download_bytes(ipfs_hash))
+
+        if len(data) <= self.cache_max_bytes:
+            self._cache[ipfs_hash] = data
+            self._cache_bytes += len(data)
+            while self._cache_bytes > self.cache_max_bytes:
+                evicted = self._cache.pop(next(iter(self._cache)))
+                self._cache_bytes -= len(evicted)
+
+        return data
+
+    async def _attempt(self, client: AsyncIPFSClient,
+                       operation: Callable[[AsyncIPFSClient], Awaitable[Any]]
+                       ) -> Tuple[AsyncIPFSClient, Any]:
+        """Run an operation against one node, updating its health state"""
+        if not await self._is_available(client):
+            return client, None
+
+        try:
+            result = await operation(client)
+        except IPFSError:
+            self._record_failure(client)
+            raise
+
+        self._record_success(client)
+        return client, result
+
+    async def _sequential(self, clients: list,
+                          operation: Callable[[AsyncIPFSClient], Awaitable[Any]]
+                          ) -> Tuple[AsyncIPFSClient, Any]:
+        """Try an operation on each node in turn until one succeeds"""
+        last_error = None
+
+        for client in clients:
+            try:
+                client, result = await self._attempt(client, operation)
+            except IPFSError as e:
+                last_error = e
+                continue
+
+            # Unavailable nodes return no result
+            if result is not None:
+                return client, result
+
+        if last_error:
+            raise last_error
+        else:
+            raise IPFSError("No IPFS nodes available")
+
+    async def _hedged(self, clients: list,
+                      operation: Callable[[AsyncIPFSClient], Awaitable[Any]]
+                      ) -> Tuple[AsyncIPFSClient, Any]:
+        """
+        Run an operation with hedged requests across nodes
+
+        The first node is tried immediately; each time the hedge delay passes
+        without a result (or an attempt fails) the next node is started as
+        well. The first successful result is returned and the rest cancelled.
+        """
+        last_error = None
+        remaining = list(clients)
+        pending = set()
+
+        try:
+            while remaining or pending:
+                if remaining:
+                    pending.add(asyncio.ensure_future(
+                        self._attempt(remaining.pop(0), operation)))
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    try:
+                        client, result = task.result()
+                    except IPFSError as e:
+                        last_error = e
+                        continue
+
+                    # Unavailable nodes return no result
+                    if result is not None:
+                        return client, result
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if last_error:
+            raise last_error
+        else:
+            raise IPFSError("No IPFS nodes available")
+
+    async def _pin_on(self, client: AsyncIPFSClient, ipfs_hash: str) -> None:
+        """Pin content on one secondary node, ignoring failures"""
+        if await self._is_available(client) and not await client.pin_file(ipfs_hash):
+            self._record_failure(client)
+
+    async def _is_available(self, client: AsyncIPFSClient) -> bool:
+        """Check node availability through the health cache"""
+        alive, expires_at, _ = self._health.get(client, (False, 0.0, 0))
+        if time.monotonic() < expires_at:
+            return alive
+
+        if await client.is_available():
+            self._record_success(client)
+            return True
+
+        self._record_failure(client)
+        return False
+
+    def _record_success(self, client: AsyncIPFSClient) -> None:
+        """Mark a node healthy and close its circuit"""
+        self._health[client] = (True, time.monotonic() + _HEALTH_TTL, 0)
+
+    def _record_failure(self, client: AsyncIPFSClient) -> None:
+        """Mark a node unhealthy and back off before probing it again"""
+        failures = self._health.get(client, (False, 0.0, 0))[2] + 1
+        backoff = min(_HEALTH_TTL * 2 ** (failures - 1), _MAX_HEALTH_BACKOFF)
+        self._health[client] = (False, time.monotonic() + backoff, failures)
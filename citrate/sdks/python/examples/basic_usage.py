@@ -12,6 +12,7 @@ This example demonstrates:
 import os
 import json
 from pathlib import Path
+import numpy as np
 from citrate_sdk import CitrateClient, ModelConfig, ModelType, AccessType
 from citrate_sdk.crypto import KeyManager
 
@@ -49,19 +50,21 @@ def main():
         return
 
     # Create a dummy model file for demo
-    model_path = Path("demo_model.json")
+    model_path = Path("demo_model.npz")
     demo_model = {
         "type": "simple_classifier",
         "version": "1.0",
         "parameters": {
             "input_size": 784,
             "output_classes": 10
-        },
-        "weights": [0.1] * 100  # Dummy weights
+        }
     }
+    weights = np.full(100, 0.1, dtype=np.float32)  # Dummy weights
 
-    with open(model_path, 'w') as f:
-        json.dump(demo_model, f)
+    # Store weights as raw float32 rather than JSON text
+    with open(model_path, 'wb') as f:
+        np.savez(f, metadata=np.frombuffer(json.dumps(demo_model).encode(), dtype=np.uint8),
+                 weights=weights)
 
     print(f"Created demo model: {model_path}")
 
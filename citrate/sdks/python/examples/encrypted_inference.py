@@ -12,6 +12,7 @@ This example demonstrates:
 import os
 import json
 from pathlib import Path
+import numpy as np
 from citrate_sdk import CitrateClient, ModelConfig, ModelType, AccessType
 from citrate_sdk.crypto import KeyManager, EncryptionConfig
 
@@ -42,7 +43,7 @@ def main():
         return
 
     # Create a sensitive AI model
-    model_path = Path("sensitive_model.json")
+    model_path = Path("sensitive_model.npz")
     sensitive_model = {
         "type": "proprietary_classifier",
         "version": "2.0",
@@ -52,12 +53,14 @@ def main():
             "activation": "relu",
             "learning_rate": 0.001
         },
-        "proprietary_weights": [0.123456] * 1000,  # Sensitive model weights
         "training_data_info": "confidential_dataset_v2"
     }
+    proprietary_weights = np.full(1000, 0.123456, dtype=np.float32)  # Sensitive model weights
 
-    with open(model_path, 'w') as f:
-        json.dump(sensitive_model, f, indent=2)
+    # Store weights as raw float32 rather than JSON text
+    with open(model_path, 'wb') as f:
+        np.savez(f, metadata=np.frombuffer(json.dumps(sensitive_model).encode(), dtype=np.uint8),
+                 proprietary_weights=proprietary_weights)
 
     print(f"Created sensitive model: {model_path}")
 
@@ -159,11 +162,10 @@ def main():
 
         # Test model integrity
         print("\n🛡️  Testing model integrity...")
-        from citrate_sdk.crypto import hash_model_data, verify_model_integrity
+        from citrate_sdk.crypto import hash_model_file, verify_model_integrity_stream
 
-        model_data = model_path.read_bytes()
-        model_hash = hash_model_data(model_data)
-        is_valid = verify_model_integrity(model_data, model_hash)
+        model_hash = hash_model_file(model_path)
+        is_valid = verify_model_integrity_stream(model_path, model_hash)
 
         print(f"Model hash: {model_hash}")
         print(f"Integrity check: {is_valid}")
@@ -10,7 +10,7 @@ This example demonstrates:
 """
 
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
 from citrate_sdk import CitrateClient, ModelConfig, ModelType, AccessType
 from citrate_sdk.crypto import KeyManager
 
@@ -26,20 +26,23 @@ def main():
 
     # Model seller
     seller = CitrateClient(rpc_url=RPC_URL, private_key=KeyManager().get_private_key())
-    print(f"Seller: {seller.key_manager.get_address()}")
+    seller_address = seller.key_manager.get_address()
+    print(f"Seller: {seller_address}")
 
     # Model buyer
     buyer = CitrateClient(rpc_url=RPC_URL, private_key=KeyManager().get_private_key())
-    print(f"Buyer: {buyer.key_manager.get_address()}")
+    buyer_address = buyer.key_manager.get_address()
+    print(f"Buyer: {buyer_address}")
 
     # Revenue partner (e.g., dataset provider)
     partner = KeyManager()
-    print(f"Partner: {partner.get_address()}")
+    partner_address = partner.get_address()
+    print(f"Partner: {partner_address}")
 
     try:
         # Check balances
-        seller_balance = seller.get_balance(seller.key_manager.get_address())
-        buyer_balance = buyer.get_balance(buyer.key_manager.get_address())
+        seller_balance = seller.get_balance(seller_address)
+        buyer_balance = buyer.get_balance(buyer_address)
 
         print(f"\nInitial balances:")
         print(f"Seller: {seller_balance / 10**18:.4f} ETH")
@@ -49,8 +52,8 @@ def main():
         print("\n💼 Seller: Deploying premium model with revenue sharing...")
 
         revenue_shares = {
-            seller.key_manager.get_address(): 0.70,  # 70% to model creator
-            partner.get_address(): 0.25,             # 25% to data provider
+            seller_address: 0.70,   # 70% to model creator
+            partner_address: 0.25,  # 25% to data provider
             "0x0000000000000000000000000000000000000001": 0.05  # 5% to platform
         }
 
@@ -129,7 +132,7 @@ def main():
 
         # Wait for transaction confirmation
         print("Waiting for transaction confirmation...")
-        time.sleep(5)
+        buyer.wait_for_receipt(purchase_tx, timeout=30)
 
         # Use the model
         print(f"\n🧠 Buyer: Running inference on purchased model...")
@@ -159,29 +162,38 @@ def main():
             buyer_client = CitrateClient(rpc_url=RPC_URL, private_key=KeyManager().get_private_key())
             buyers.append(buyer_client)
 
-        # Simulate purchases and usage
+        def simulate_buyer(i, buyer_client):
+            """Purchase access and run one inference as an independent user"""
+            # Purchase access
+            purchase_tx = buyer_client.purchase_model_access(
+                model_id=deployment.model_id,
+                payment_amount=config.access_price
+            )
+            buyer_client.wait_for_receipt(purchase_tx, timeout=30)
+
+            # Run inference
+            return buyer_client.inference(
+                model_id=deployment.model_id,
+                input_data={"image": f"test_image_{i+1}"}
+            )
+
+        # Simulate purchases and usage; users are independent, so run them concurrently
+        print(f"Users 1-{len(buyers)}: Purchasing and using model...")
         total_revenue = 0
-        for i, buyer_client in enumerate(buyers):
-            print(f"User {i+1}: Purchasing and using model...")
+        with ThreadPoolExecutor(max_workers=len(buyers)) as executor:
+            futures = [
+                executor.submit(simulate_buyer, i, buyer_client)
+                for i, buyer_client in enumerate(buyers)
+            ]
 
-            try:
-                # Purchase access
-                purchase_tx = buyer_client.purchase_model_access(
-                    model_id=deployment.model_id,
-                    payment_amount=config.access_price
-                )
+            for i, future in enumerate(futures):
+                try:
+                    future.result()
+                    total_revenue += config.access_price
+                    print(f"  ✅ User {i+1} completed inference")
 
-                # Run inference
-                result = buyer_client.inference(
-                    model_id=deployment.model_id,
-                    input_data={"image": f"test_image_{i+1}"}
-                )
-
-                total_revenue += config.access_price
-                print(f"  ✅ User {i+1} completed inference")
-
-            except Exception as e:
-                print(f"  ❌ User {i+1} failed: {e}")
+                except Exception as e:
+                    print(f"  ❌ User {i+1} failed: {e}")
 
         # Check final marketplace stats
         print(f"\n📈 Final marketplace statistics:")
@@ -191,7 +203,7 @@ def main():
         print(f"Total revenue: {updated_model_info.get('total_revenue', 0) / 10**18} ETH")
 
         # Check seller revenue
-        final_seller_balance = seller.get_balance(seller.key_manager.get_address())
+        final_seller_balance = seller.get_balance(seller_address)
         revenue_earned = (final_seller_balance - seller_balance) / 10**18
 
         print(f"Seller revenue earned: {revenue_earned:.4f} ETH")
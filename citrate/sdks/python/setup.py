@@ -42,9 +42,19 @@ setup(
     python_requires=">=3.8",
     install_requires=requirements,
     extras_require={
+        "fast": [
+            "coincurve>=18.0",
+            "orjson>=3.8",
+        ],
+        "async": [
+            "httpx[http2]>=0.24",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-asyncio",
+            "responses",
+            "uvloop; sys_platform != 'win32'",
+            "filelock",
             "black",
             "flake8",
             "mypy",
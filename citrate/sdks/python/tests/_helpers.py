@@ -0,0 +1,28 @@
+"""
+Shared mocking helpers for unit tests
+"""
+
+from typing import Any, Dict, Optional
+
+import responses
+
+
+def mock_rpc(url: str, result: Any = None,
+             error: Optional[Dict[str, Any]] = None) -> responses.BaseResponse:
+    """
+    Register a canned JSON-RPC reply for POSTs to url with the active responses mock
+
+    Args:
+        url: RPC endpoint URL to answer
+        result: Value returned as the call's result
+        error: JSON-RPC error object returned instead of a result
+
+    Returns:
+        The registered response, whose call_count tracks matching requests
+    """
+    reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": 1}
+    if error is None:
+        reply["result"] = result
+    else:
+        reply["error"] = error
+    return responses.add(responses.POST, url, json=reply)
@@ -0,0 +1,35 @@
+"""
+Polling helpers for tests that wait on chain state
+"""
+
+import time
+from typing import Callable
+
+
+def wait_until(pred: Callable[[], bool], timeout: float,
+               initial: float = 0.05, factor: float = 1.5) -> bool:
+    """
+    Poll a predicate with exponential backoff until it holds or time runs out
+
+    Args:
+        pred: Zero-argument callable polled until it returns a truthy value
+        timeout: Maximum time to wait in seconds
+        initial: Delay before the second poll in seconds
+        factor: Multiplier applied to the delay after each poll
+
+    Returns:
+        True if the predicate held before the timeout, False otherwise
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+
+    while True:
+        if pred():
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+
+        time.sleep(min(delay, remaining))
+        delay *= factor
@@ -0,0 +1,25 @@
+"""
+Shared pytest configuration for Citrate SDK tests
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
+# Run async tests on uvloop where it is installed (not available on Windows);
+# pytest-asyncio creates its loops from the current policy
+if uvloop is not None and sys.platform != "win32":
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+@pytest.fixture(scope="session")
+def poll_interval() -> float:
+    """Initial delay for polling helpers; set CITRATE_POLL_INTERVAL to tune in CI"""
+    return float(os.environ.get("CITRATE_POLL_INTERVAL", "0.05"))
@@ -0,0 +1,67 @@
+"""
+Unit tests for Citrate SDK async client
+"""
+
+import asyncio
+import json
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from citrate_sdk.async_client import AsyncCitrateClient
+from citrate_sdk.errors import CitrateError
+
+
+def _rpc_transport(results):
+    """Build an httpx mock transport answering JSON-RPC calls by method"""
+    def handler(request):
+        payload = json.loads(request.content)
+        if isinstance(payload, list):
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": call["id"], **results[call["method"]]}
+                for call in reversed(payload)
+            ])
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"],
+                                         **results[payload["method"]]})
+    return httpx.MockTransport(handler)
+
+
+def _client(results):
+    """Build an AsyncCitrateClient backed by a mock transport"""
+    return AsyncCitrateClient(
+        "http://localhost:8545",
+        client=httpx.AsyncClient(transport=_rpc_transport(results))
+    )
+
+
+class TestAsyncCitrateClient:
+    """Test cases for AsyncCitrateClient"""
+
+    async def test_concurrent_calls(self):
+        """Test many calls can be gathered over one client"""
+        client = _client({"eth_blockNumber": {"result": "0x10"}})
+
+        results = await asyncio.gather(*[client.get_block_number() for _ in range(20)])
+
+        assert results == [16] * 20
+        await client._client.aclose()
+
+    async def test_rpc_error(self):
+        """Test RPC errors raise CitrateError"""
+        client = _client({"invalid_method": {"error": {"code": -32601, "message": "Method not found"}}})
+
+        with pytest.raises(CitrateError, match="RPC error: Method not found"):
+            await client._rpc_call_async("invalid_method")
+        await client._client.aclose()
+
+    async def test_rpc_batch_async(self):
+        """Test batch results are returned in call order"""
+        client = _client({
+            "eth_chainId": {"result": "0x539"},
+            "eth_blockNumber": {"result": "0x10"}
+        })
+
+        results = await client._rpc_batch_async([("eth_chainId", []), ("eth_blockNumber", [])])
+
+        assert results == ["0x539", "0x10"]
+        await client._client.aclose()
@@ -5,13 +5,72 @@ Unit tests for Citrate SDK client
 import pytest
 import json
 import tempfile
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+import responses
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
 
 from citrate_sdk import CitrateClient, ModelConfig, ModelType, AccessType
 from citrate_sdk.errors import CitrateError, ModelNotFoundError
 from citrate_sdk.crypto import KeyManager
 
+from ._helpers import mock_rpc
+
+MOCK_RPC_URL = "http://mock"
+
+
+@pytest.fixture(scope="module")
+def _shared_client():
+    """One client (and HTTP session) reused by every HTTP-level test"""
+    return CitrateClient(MOCK_RPC_URL)
+
+
+@pytest.fixture
+def client(_shared_client):
+    """Shared client with its RPC cache cleared"""
+    _shared_client.cache_clear()
+    return _shared_client
+
+
+@pytest.fixture
+def rpc():
+    """Mock HTTP for the test and yield mock_rpc bound to MOCK_RPC_URL"""
+    with responses.mock:
+        yield partial(mock_rpc, MOCK_RPC_URL)
+
+
+class _RPCHandler(BaseHTTPRequestHandler):
+    """Answers every JSON-RPC request with block number 0x1 over keep-alive"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({"jsonrpc": "2.0", "result": "0x1", "id": request["id"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def rpc_server():
+    """Local HTTP JSON-RPC server, yielding its URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RPCHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01},
+                              daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
 
 class TestCitrateClient:
     """Test cases for CitrateClient"""
@@ -21,76 +80,105 @@ class TestCitrateClient:
         self.mock_private_key = "0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
         self.mock_rpc_url = "http://localhost:8545"
 
-    @patch('requests.Session.post')
-    def test_rpc_call_success(self, mock_post):
+    def test_rpc_call_success(self, client, rpc):
         """Test successful RPC call"""
-        # Setup mock response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "result": "0x1",
-            "id": 1
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        rpc(result="0x1")
 
-        client = CitrateClient(self.mock_rpc_url)
-        result = client._rpc_call("eth_chainId")
+        result = client._rpc_call("eth_blockNumber")
 
         assert result == "0x1"
-        mock_post.assert_called_once()
+        assert len(responses.calls) == 1
 
-    @patch('requests.Session.post')
-    def test_rpc_call_error(self, mock_post):
+    def test_rpc_call_error(self, client, rpc):
         """Test RPC call with error response"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "error": {"code": -32602, "message": "Invalid params"},
-            "id": 1
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
-
-        client = CitrateClient(self.mock_rpc_url)
+        rpc(error={"code": -32602, "message": "Invalid params"})
 
         with pytest.raises(CitrateError, match="RPC error: Invalid params"):
             client._rpc_call("invalid_method")
 
-    @patch('requests.Session.post')
-    def test_get_chain_id(self, mock_post):
+    @responses.activate
+    def test_rpc_batch_orders_results_by_id(self, client):
+        """Test batch results are returned in call order regardless of reply order"""
+        def reply(request):
+            calls = json.loads(request.body)
+            return 200, {}, json.dumps([
+                {"jsonrpc": "2.0", "result": hex(i + 1), "id": call["id"]}
+                for i, call in reversed(list(enumerate(calls)))
+            ])
+
+        responses.add_callback(responses.POST, MOCK_RPC_URL, callback=reply)
+
+        results = client._rpc_batch([("eth_chainId", []), ("eth_blockNumber", [])])
+
+        assert results == ["0x1", "0x2"]
+        assert len(responses.calls) == 1
+        payload = json.loads(responses.calls[0].request.body)
+        assert [call["method"] for call in payload] == ["eth_chainId", "eth_blockNumber"]
+
+    @responses.activate
+    def test_rpc_batch_error(self, client):
+        """Test errors from any call in a batch are raised together"""
+        def reply(request):
+            first, second = json.loads(request.body)
+            return 200, {}, json.dumps([
+                {"jsonrpc": "2.0", "result": "0x1", "id": first["id"]},
+                {"jsonrpc": "2.0", "error": {"code": -32601, "message": "Method not found"},
+                 "id": second["id"]}
+            ])
+
+        responses.add_callback(responses.POST, MOCK_RPC_URL, callback=reply)
+
+        with pytest.raises(CitrateError, match="invalid_method: Method not found"):
+            client._rpc_batch([("eth_chainId", []), ("invalid_method", [])])
+
+    def test_get_chain_id(self, client, rpc):
         """Test chain ID retrieval"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "result": "0x539",  # 1337 in hex
-            "id": 1
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        rpc(result="0x539")  # 1337 in hex
 
-        client = CitrateClient(self.mock_rpc_url)
         chain_id = client.get_chain_id()
 
-        assert chain_id == "0x539"
+        assert chain_id == 1337
+
+    def test_chain_id_cached(self, client, rpc):
+        """Test the chain ID is fetched once and then served from the cache"""
+        rpc(result="0x539")
+
+        assert client.get_chain_id() == client.get_chain_id() == 1337
+        assert len(responses.calls) == 1
+
+        client.cache_clear()
+        client.get_chain_id()
+        assert len(responses.calls) == 2
+
+    def test_block_cache_skips_latest(self, client, rpc):
+        """Test fixed-height blocks are cached but the latest block is not"""
+        rpc(result={"number": "0x0"})
+
+        for _ in range(2):
+            client._rpc_call("eth_getBlockByNumber", ["0x0", False])
+        assert len(responses.calls) == 1
 
-    @patch('requests.Session.post')
-    def test_get_balance(self, mock_post):
+        for _ in range(2):
+            client._rpc_call("eth_getBlockByNumber", ["latest", False])
+        assert len(responses.calls) == 3
+
+    def test_get_balance(self, client, rpc):
         """Test balance retrieval"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "jsonrpc": "2.0",
-            "result": "0xde0b6b3a7640000",  # 1 ETH in wei
-            "id": 1
-        }
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        rpc(result="0xde0b6b3a7640000")  # 1 ETH in wei
 
-        client = CitrateClient(self.mock_rpc_url)
         balance = client.get_balance("0x1234567890123456789012345678901234567890")
 
         assert balance == 1000000000000000000  # 1 ETH in wei
 
+    def test_get_balance_invalid_address(self, client, rpc):
+        """Test malformed addresses are rejected before any RPC call"""
+        reply = rpc(result="0x0")
+
+        with pytest.raises(CitrateError, match="Invalid address"):
+            client.get_balance("not_a_valid_address")
+
+        assert reply.call_count == 0
+
     def test_client_initialization_with_key(self):
         """Test client initialization with private key"""
         client = CitrateClient(self.mock_rpc_url, self.mock_private_key)
@@ -99,6 +187,30 @@ class TestCitrateClient:
         assert client.key_manager is not None
         assert client.key_manager.get_private_key() == self.mock_private_key[2:]  # Without 0x prefix
 
+    def test_client_uses_shared_session(self):
+        """Test clients can share one HTTP session"""
+        session = requests.Session()
+        client1 = CitrateClient(self.mock_rpc_url, session=session)
+        client2 = CitrateClient(self.mock_rpc_url, session=session)
+
+        assert client1.session is client2.session is session
+        assert session.headers['Content-Type'] == 'application/json'
+
+    def test_concurrent_reuses_connection(self, rpc_server, caplog):
+        """Test concurrent calls share one sized connection pool"""
+        client = CitrateClient(rpc_server)
+
+        with caplog.at_level("WARNING", logger="urllib3"), ThreadPoolExecutor(max_workers=20) as executor:
+            results = list(executor.map(lambda _: client._rpc_call("eth_blockNumber"), range(20)))
+
+        assert results == ["0x1"] * 20
+        pools = client.session.get_adapter(rpc_server).poolmanager.pools
+        assert len(pools) == 1
+        pool = pools[next(iter(pools.keys()))]
+        assert pool.pool.maxsize == 32
+        # No connection opened for the burst was discarded on return
+        assert "Connection pool is full" not in caplog.text
+
     def test_client_initialization_without_key(self):
         """Test client initialization without private key"""
         client = CitrateClient(self.mock_rpc_url)
@@ -109,7 +221,7 @@ class TestCitrateClient:
     @patch.object(CitrateClient, '_rpc_call')
     @patch.object(CitrateClient, '_upload_to_ipfs')
     @patch.object(CitrateClient, '_send_transaction')
-    @patch.object(CitrateClient, '_wait_for_receipt')
+    @patch.object(CitrateClient, 'wait_for_receipt')
     @patch.object(CitrateClient, '_extract_model_id_from_receipt')
     def test_deploy_model(self, mock_extract, mock_wait, mock_send, mock_upload, mock_rpc):
         """Test model deployment"""
@@ -160,7 +272,7 @@ class TestCitrateClient:
 
     @patch.object(CitrateClient, '_rpc_call')
     @patch.object(CitrateClient, '_send_transaction')
-    @patch.object(CitrateClient, '_wait_for_receipt')
+    @patch.object(CitrateClient, 'wait_for_receipt')
     @patch.object(CitrateClient, '_extract_inference_output')
     def test_inference(self, mock_extract, mock_wait, mock_send, mock_rpc):
         """Test inference execution"""
@@ -220,6 +332,70 @@ class TestCitrateClient:
         assert models[0]["model_id"] == "model_1"
         assert models[1]["model_id"] == "model_2"
 
+    @patch.object(KeyManager, 'sign_transaction', return_value="0xsigned")
+    @patch.object(CitrateClient, '_rpc_call')
+    def test_nonce_fetched_once(self, mock_rpc, mock_sign):
+        """Test sequential sends fetch the nonce once and increment locally"""
+        mock_rpc.side_effect = lambda method, params=None: (
+            "0x5" if method == "eth_getTransactionCount" else "0xtxhash"
+        )
+
+        client = CitrateClient(self.mock_rpc_url, self.mock_private_key)
+        for _ in range(5):
+            client._send_transaction("0x" + "00" * 20, {})
+
+        methods = [call.args[0] for call in mock_rpc.call_args_list]
+        assert methods.count("eth_getTransactionCount") == 1
+        assert [call.args[0]["nonce"] for call in mock_sign.call_args_list] == \
+            ["0x5", "0x6", "0x7", "0x8", "0x9"]
+
+    @patch.object(KeyManager, 'sign_transaction', return_value="0xsigned")
+    @patch.object(CitrateClient, '_rpc_call')
+    def test_nonce_resynced_after_failed_send(self, mock_rpc, mock_sign):
+        """Test a failed send makes the next send refetch the nonce"""
+        sends = iter([CitrateError("RPC error: nonce too low"), "0xtxhash"])
+
+        def rpc(method, params=None):
+            if method == "eth_getTransactionCount":
+                return "0x5"
+            result = next(sends)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        mock_rpc.side_effect = rpc
+
+        client = CitrateClient(self.mock_rpc_url, self.mock_private_key)
+        with pytest.raises(CitrateError):
+            client._send_transaction("0x" + "00" * 20, {})
+        client._send_transaction("0x" + "00" * 20, {})
+
+        methods = [call.args[0] for call in mock_rpc.call_args_list]
+        assert methods.count("eth_getTransactionCount") == 2
+
+    @patch('citrate_sdk.client.time.sleep')
+    @patch.object(CitrateClient, '_rpc_call')
+    def test_wait_for_receipt_backs_off(self, mock_rpc, mock_sleep):
+        """Test receipt polling backs off exponentially until mined"""
+        receipt = {"status": "0x1"}
+        mock_rpc.side_effect = [None, None, None, None, None, receipt]
+
+        client = CitrateClient(self.mock_rpc_url)
+        assert client.wait_for_receipt("0xabc", poll_interval=0.1, max_poll_interval=0.5) == receipt
+
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert delays == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+    @patch('citrate_sdk.client.time.sleep')
+    @patch.object(CitrateClient, '_rpc_call')
+    def test_wait_for_receipt_timeout(self, mock_rpc, mock_sleep):
+        """Test receipt polling gives up after the timeout"""
+        mock_rpc.return_value = None
+
+        client = CitrateClient(self.mock_rpc_url)
+        with pytest.raises(CitrateError, match="Transaction timeout"):
+            client.wait_for_receipt("0xabc", timeout=0)
+
 
 class TestModelConfig:
     """Test cases for ModelConfig"""
@@ -257,25 +433,37 @@ class TestModelConfig:
 class TestErrorHandling:
     """Test error handling scenarios"""
 
-    @patch('requests.Session.post')
-    def test_network_error(self, mock_post):
+    @responses.activate
+    def test_network_error(self, client):
         """Test network error handling"""
-        mock_post.side_effect = Exception("Network error")
-
-        client = CitrateClient("http://localhost:8545")
+        responses.add(responses.POST, MOCK_RPC_URL, body=requests.ConnectionError("Network error"))
 
         with pytest.raises(CitrateError, match="Network error"):
             client._rpc_call("test_method")
 
-    @patch('requests.Session.post')
-    def test_invalid_json_response(self, mock_post):
-        """Test invalid JSON response handling"""
-        mock_response = Mock()
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+    @responses.activate
+    def test_gateway_error_retried_for_reads(self, client):
+        """A 502 on a read is resent by the session's retry policy"""
+        responses.add(responses.POST, MOCK_RPC_URL, status=502)
+        success = mock_rpc(MOCK_RPC_URL, result="0x1")
+
+        assert client._rpc_call("eth_blockNumber") == "0x1"
+        assert success.call_count == 1
+
+    @responses.activate
+    def test_gateway_error_not_retried_for_transactions(self, client):
+        """A 502 on a transaction is reported, not resent to the node"""
+        gateway_error = responses.add(responses.POST, MOCK_RPC_URL, status=502)
+        mock_rpc(MOCK_RPC_URL, result="0x" + "ab" * 32)
 
-        client = CitrateClient("http://localhost:8545")
+        with pytest.raises(CitrateError, match="Network error"):
+            client._rpc_call("eth_sendRawTransaction", ["0x00"])
+        assert gateway_error.call_count == 1
+
+    @responses.activate
+    def test_invalid_json_response(self, client):
+        """Test invalid JSON response handling"""
+        responses.add(responses.POST, MOCK_RPC_URL, body="Invalid JSON")
 
         with pytest.raises(CitrateError, match="Invalid JSON response"):
-            client._rpc_call("test_method")
\ No newline at end of file
+            client._rpc_call("test_method")
@@ -8,7 +8,7 @@ from unittest.mock import patch, Mock
 
 from citrate_sdk.crypto import (
     KeyManager, EncryptionConfig, generate_model_key,
-    hash_model_data, verify_model_integrity
+    hash_model_data, hash_model_file, verify_model_integrity, verify_model_integrity_stream
 )
 from citrate_sdk.errors import CitrateError
 
@@ -44,6 +44,32 @@ class TestKeyManager:
         assert address.startswith("0x")
         assert len(address) == 42
 
+    def test_address_is_cached(self):
+        """Test the address is derived once, not on every get_address call"""
+        key_manager = KeyManager()
+        address = key_manager.get_address()
+
+        with patch("eth_keys.datatypes.PublicKey.to_checksum_address") as mock_derive:
+            for _ in range(100):
+                assert key_manager.get_address() == address
+
+        mock_derive.assert_not_called()
+
+    def test_sign_message_matches_eth_account(self):
+        """Test libsecp256k1 signing matches eth_account and recovers the address"""
+        from eth_account import Account
+        from eth_account.messages import encode_defunct
+
+        key_manager = KeyManager()
+        message = b"Test message"
+        signature = key_manager.sign_message(message)
+
+        with patch("citrate_sdk.crypto.coincurve", None):
+            assert key_manager.sign_message(message) == signature
+
+        recovered = Account.recover_message(encode_defunct(primitive=message), signature=signature)
+        assert recovered == key_manager.get_address()
+
     def test_get_public_key(self):
         """Test public key generation"""
         key_manager = KeyManager()
@@ -52,6 +78,17 @@ class TestKeyManager:
         assert len(public_key) == 64  # 32 bytes in hex
         assert all(c in "0123456789abcdef" for c in public_key)
 
+    def test_get_public_key_secp256k1_matches_openssl(self):
+        """Test libsecp256k1 and OpenSSL backends expose the same public key"""
+        pytest.importorskip("coincurve")
+        private_key = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+
+        fast_public_key = KeyManager(private_key).get_public_key()
+        with patch("citrate_sdk.ecdh_real.coincurve", None):
+            openssl_public_key = KeyManager(private_key).get_public_key()
+
+        assert fast_public_key == openssl_public_key
+
     def test_encrypt_decrypt_data_roundtrip(self):
         """Test data encryption/decryption roundtrip"""
         key_manager = KeyManager()
@@ -63,6 +100,22 @@ class TestKeyManager:
         assert decrypted_data == original_data
         assert encrypted_data != original_data
 
+    def test_decrypt_legacy_json_package(self):
+        """Test decryption of the legacy hex/JSON data package"""
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        key_manager = KeyManager()
+        key = bytes(range(32))
+        nonce = bytes(12)
+        ciphertext = AESGCM(key).encrypt(nonce, b"legacy payload", None)
+        package = json.dumps({
+            "ciphertext": ciphertext.hex(),
+            "nonce": nonce.hex(),
+            "key": key.hex()
+        })
+
+        assert key_manager.decrypt_data(package) == "legacy payload"
+
     def test_encrypt_decrypt_unicode_data(self):
         """Test encryption/decryption with unicode characters"""
         key_manager = KeyManager()
@@ -98,6 +151,38 @@ class TestKeyManager:
 
         assert decrypted_data == model_data
 
+    def test_decrypt_model_data_with_new_instance(self):
+        """Test model decryption by a separate KeyManager for the same key"""
+        private_key = "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+        owner = KeyManager(private_key)
+        model_data = b"Mock model weights and parameters"
+
+        encrypted_data, metadata = owner.encrypt_model(model_data, EncryptionConfig())
+        decrypted_data = KeyManager(private_key).decrypt_model(encrypted_data, metadata)
+
+        assert decrypted_data == model_data
+
+    def test_decrypt_legacy_wrapped_key(self):
+        """Test unwrapping an owner key stored in the legacy hex/JSON package"""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+        key_manager = KeyManager()
+        salt = bytes(32)
+        nonce = bytes(12)
+        owner_key = HKDF(
+            algorithm=hashes.SHA256(), length=32, salt=salt, info=b'citrate-key-wrapping'
+        ).derive(key_manager.account.key)
+        model_key = bytes(range(32))
+        package = json.dumps({
+            "encrypted_key": AESGCM(owner_key).encrypt(nonce, model_key, None).hex(),
+            "nonce": nonce.hex(),
+            "salt": salt.hex()
+        })
+
+        assert key_manager._decrypt_key_from_owner(package) == model_key
+
     def test_derive_shared_key(self):
         """Test ECDH shared key derivation"""
         alice = KeyManager()
@@ -115,6 +200,20 @@ class TestKeyManager:
         # With real ECDH implementation, shared keys should be identical
         assert alice_shared == bob_shared
 
+    def test_derive_shared_key_secp256k1_matches_openssl(self):
+        """Test libsecp256k1 and OpenSSL ECDH paths derive the same key"""
+        pytest.importorskip("coincurve")
+        alice = KeyManager()
+        bob = KeyManager()
+
+        bob_pubkey = bob.get_public_key()
+        fast_shared = alice.derive_shared_key(bob_pubkey)
+
+        with patch.object(alice.ecdh_manager, "_cc", None):
+            openssl_shared = alice.derive_shared_key(bob_pubkey)
+
+        assert fast_shared == openssl_shared
+
     def test_key_shares_creation(self):
         """Test Shamir's secret sharing key creation"""
         key_manager = KeyManager()
@@ -226,6 +325,14 @@ class TestCryptoUtilities:
         hash1_repeat = hash_model_data(data1)
         assert hash1 == hash1_repeat
 
+    def test_hash_large_model_data(self):
+        """Test hashing of buffers above the memoryview threshold"""
+        import hashlib
+
+        data = bytes(range(256)) * 8192  # 2 MiB
+
+        assert hash_model_data(data) == hashlib.sha256(data).hexdigest()
+
     def test_verify_model_integrity_valid(self):
         """Test model integrity verification with valid hash"""
         data = b"Test model data for integrity check"
@@ -251,6 +358,36 @@ class TestCryptoUtilities:
         is_valid = verify_model_integrity(tampered_data, original_hash)
         assert is_valid == False
 
+    def test_keccak256_matches_eth_utils(self):
+        """Test the native Keccak-256 helper matches the Ethereum reference"""
+        from eth_utils import keccak
+        from citrate_sdk.crypto import _keccak256
+
+        for data in (b"", b"citrate", bytes(range(256))):
+            assert _keccak256(data) == keccak(data)
+
+    def test_verify_model_integrity_stream(self, tmp_path):
+        """Test streaming integrity verification from a file path and file object"""
+        data = bytes(range(256)) * 1000
+        model_file = tmp_path / "model.bin"
+        model_file.write_bytes(data)
+        expected_hash = hash_model_data(data)
+
+        assert verify_model_integrity_stream(model_file, expected_hash, chunk_size=4096)
+        assert verify_model_integrity_stream(str(model_file), expected_hash.upper())
+        with open(model_file, "rb") as f:
+            assert verify_model_integrity_stream(f, expected_hash)
+
+        assert not verify_model_integrity_stream(model_file, hash_model_data(b"other"))
+
+    def test_hash_model_file_matches_hash_model_data(self, tmp_path):
+        """Test file hashing agrees with in-memory hashing"""
+        data = bytes(range(256)) * 1000
+        model_file = tmp_path / "model.bin"
+        model_file.write_bytes(data)
+
+        assert hash_model_file(model_file, chunk_size=4096) == hash_model_data(data)
+
 
 class TestErrorScenarios:
     """Test error handling in crypto operations"""
@@ -0,0 +1,357 @@
+"""
+Unit tests for Citrate SDK IPFS module
+"""
+
+import pytest
+import io
+import json
+import threading
+from unittest.mock import Mock, patch
+
+from citrate_sdk.ipfs import IPFSClient, IPFSManager
+from citrate_sdk.errors import IPFSError
+
+
+def _consume_upload(captured):
+    """Build a fake session.post that drains the streamed upload body"""
+    def post(url, data=None, headers=None, params=None, **kwargs):
+        response = Mock()
+        response.status_code = 200
+        if url.endswith("/api/v0/add"):
+            captured["body"] = b"".join(bytes(chunk) for chunk in data)
+            captured["content_type"] = headers["Content-Type"]
+            response.content = b'{"Hash": "QmTestHash", "Size": "42"}'
+        else:
+            response.content = b'{"Hash": "QmTestHash", "NumLinks": 0}'
+        return response
+    return post
+
+
+class TestIPFSClient:
+    """Test cases for IPFSClient"""
+
+    def test_session_uses_pooled_adapter(self):
+        """Test the session mounts a sized keep-alive connection pool"""
+        client = IPFSClient("http://localhost:5001")
+        adapter = client.session.get_adapter("http://localhost:5001")
+
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.connect == 3
+        assert client.session.headers["Connection"] == "keep-alive"
+
+    def test_multipart_body_streams_file_in_chunks(self):
+        """Test the multipart body is produced chunk by chunk"""
+        data = b"x" * 10 + b"y" * 10
+        # Chunks share one read buffer, so copy each before reading the next
+        chunks = [
+            bytes(chunk)
+            for chunk in IPFSClient._multipart_body(io.BytesIO(data), "b0undary", chunk_size=8)
+        ]
+
+        # Preamble, three file chunks (8 + 8 + 4 bytes) and the closing boundary
+        assert len(chunks) == 5
+        body = b"".join(chunks)
+        assert body.startswith(b"--b0undary\r\n")
+        assert data in body
+        assert body.endswith(b"\r\n--b0undary--\r\n")
+
+    def test_upload_bytes_streams_multipart(self):
+        """Test upload_bytes sends a streamed multipart body"""
+        captured = {}
+        client = IPFSClient("http://localhost:5001")
+
+        with patch.object(client.session, "post", side_effect=_consume_upload(captured)):
+            ipfs_hash = client.upload_bytes(b"model weights")
+
+        assert ipfs_hash == "QmTestHash"
+        assert b"model weights" in captured["body"]
+        boundary = captured["content_type"].split("boundary=")[1]
+        assert captured["body"].endswith(f"--{boundary}--\r\n".encode())
+
+    def test_upload_skips_verification_by_default(self):
+        """Test a plain upload makes a single add request"""
+        client = IPFSClient("http://localhost:5001")
+
+        with patch.object(client.session, "post", side_effect=_consume_upload({})) as mock_post:
+            client.upload_bytes(b"model weights")
+
+        assert mock_post.call_count == 1
+
+    def test_upload_with_verify_stats_object(self):
+        """Test verify=True confirms the CID with object/stat"""
+        client = IPFSClient("http://localhost:5001")
+
+        with patch.object(client.session, "post", side_effect=_consume_upload({})) as mock_post:
+            client.upload_bytes(b"model weights", verify=True)
+
+        assert mock_post.call_count == 2
+        assert mock_post.call_args.args[0].endswith("/api/v0/object/stat")
+
+    def test_upload_bytes_skips_duplicate_content(self):
+        """Test re-uploading identical bytes returns the known CID without a request"""
+        client = IPFSClient("http://localhost:5001")
+
+        with patch.object(client.session, "post", side_effect=_consume_upload({})) as mock_post:
+            assert client.upload_bytes(b"model weights") == "QmTestHash"
+            assert client.upload_bytes(b"model weights") == "QmTestHash"
+            client.upload_bytes(b"other weights")
+
+        assert mock_post.call_count == 2
+
+    def test_upload_file(self, tmp_path):
+        """Test upload_file streams the file from disk"""
+        model_file = tmp_path / "model.bin"
+        model_file.write_bytes(b"\x00\x01" * 1000)
+        captured = {}
+        client = IPFSClient("http://localhost:5001")
+
+        with patch.object(client.session, "post", side_effect=_consume_upload(captured)):
+            ipfs_hash = client.upload_file(model_file)
+
+        assert ipfs_hash == "QmTestHash"
+        assert b"\x00\x01" * 1000 in captured["body"]
+
+    def test_upload_file_missing(self, tmp_path):
+        """Test upload_file reports unreadable files as IPFSError"""
+        client = IPFSClient("http://localhost:5001")
+
+        with pytest.raises(IPFSError, match="Cannot read file"):
+            client.upload_file(tmp_path / "missing.bin")
+
+    def test_upload_http_error(self):
+        """Test non-200 upload responses raise IPFSError"""
+        client = IPFSClient("http://localhost:5001")
+        response = Mock()
+        response.status_code = 500
+
+        with patch.object(client.session, "post", return_value=response):
+            with pytest.raises(IPFSError, match="HTTP 500"):
+                client.upload_bytes(b"data")
+
+    def test_upload_large_puts_blocks_and_links_them(self):
+        """Test upload_large stores raw leaves in order under one file node"""
+        client = IPFSClient("http://localhost:5001")
+        nodes = []
+
+        def post(url, files=None, params=None, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            if url.endswith("/block/put"):
+                response.content = json.dumps({"Key": "leaf-" + files["file"].decode()}).encode()
+            elif url.endswith("/dag/put"):
+                nodes.append(json.loads(files["file"]))
+                response.content = b'{"Cid": {"/": "QmRoot"}}'
+            return response
+
+        with patch.object(client.session, "post", side_effect=post):
+            root = client.upload_large(b"aaabbbc", chunk_size=3, parallelism=2)
+
+        assert root == "QmRoot"
+        assert len(nodes) == 1
+        assert [link["Hash"]["/"] for link in nodes[0]["Links"]] == ["leaf-aaa", "leaf-bbb", "leaf-c"]
+        assert IPFSClient._unixfs_file_data(7, [3, 3, 1]) == b"\x08\x02\x18\x07\x20\x03\x20\x03\x20\x01"
+
+    def test_status_probe_is_shared_and_memoized(self):
+        """Test is_available and get_version share one /version request"""
+        client = IPFSClient("http://localhost:5001")
+        response = Mock()
+        response.status_code = 200
+        response.content = b'{"Version": "0.24.0"}'
+
+        with patch.object(client.session, "post", return_value=response) as mock_post:
+            assert client.is_available()
+            assert client.get_version() == "0.24.0"
+
+        mock_post.assert_called_once()
+
+    def _streaming_response(self, chunks, status_code=200):
+        """Build a fake streaming /cat response"""
+        response = Mock()
+        response.status_code = status_code
+        response.iter_content.return_value = iter(chunks)
+        return response
+
+    def test_download_bytes_uses_streaming(self):
+        """Test download_bytes accumulates a streamed response"""
+        client = IPFSClient("http://localhost:5001")
+        response = self._streaming_response([b"abc", b"def"])
+
+        with patch.object(client.session, "post", return_value=response) as mock_post:
+            data = client.download_bytes("QmTestHash")
+
+        assert data == b"abcdef"
+        assert mock_post.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+
+    def test_download_to_file(self, tmp_path):
+        """Test download_to_file writes chunks to disk"""
+        client = IPFSClient("http://localhost:5001")
+        dst = tmp_path / "model.bin"
+
+        with patch.object(client.session, "post",
+                          return_value=self._streaming_response([b"abc", b"def"])):
+            client.download_to_file("QmTestHash", dst)
+
+        assert dst.read_bytes() == b"abcdef"
+
+    def test_download_to_file_removes_partial_file(self, tmp_path):
+        """Test failed downloads do not leave a partial file behind"""
+        client = IPFSClient("http://localhost:5001")
+        dst = tmp_path / "model.bin"
+
+        with patch.object(client.session, "post",
+                          return_value=self._streaming_response([], status_code=404)):
+            with pytest.raises(IPFSError, match="HTTP 404"):
+                client.download_to_file("QmTestHash", dst)
+
+        assert not dst.exists()
+
+
+class TestIPFSManager:
+    """Test cases for IPFSManager"""
+
+    def _manager(self, fallback_count=1):
+        """Build a manager whose clients are mocks"""
+        manager = IPFSManager("http://primary:5001",
+                              [f"http://fallback{i}:5001" for i in range(fallback_count)])
+        manager.primary = Mock(spec=IPFSClient)
+        manager.fallbacks = [Mock(spec=IPFSClient) for _ in range(fallback_count)]
+        return manager
+
+    def test_health_probe_is_cached(self):
+        """Test repeated uploads reuse a cached availability probe"""
+        manager = self._manager(fallback_count=0)
+        manager.primary.is_available.return_value = True
+        manager.primary.upload_bytes.return_value = "QmTestHash"
+
+        assert manager.upload(b"one") == "QmTestHash"
+        assert manager.upload(b"two") == "QmTestHash"
+
+        manager.primary.is_available.assert_called_once()
+
+    def test_failing_node_is_skipped_while_circuit_open(self):
+        """Test a node that failed an upload is not retried immediately"""
+        manager = self._manager()
+        primary, fallback = manager.primary, manager.fallbacks[0]
+        primary.is_available.return_value = True
+        primary.upload_bytes.side_effect = IPFSError("upload failed")
+        fallback.is_available.return_value = True
+        fallback.upload_bytes.return_value = "QmFallbackHash"
+
+        assert manager.upload(b"one") == "QmFallbackHash"
+        assert manager.upload(b"two") == "QmFallbackHash"
+
+        primary.upload_bytes.assert_called_once()
+
+    def test_circuit_reopens_after_backoff(self):
+        """Test an unhealthy node is probed again once its backoff expires"""
+        manager = self._manager(fallback_count=0)
+        manager.primary.is_available.side_effect = [False, True]
+        manager.primary.upload_bytes.return_value = "QmTestHash"
+
+        with patch("citrate_sdk.ipfs.time.monotonic", return_value=1000.0):
+            with pytest.raises(IPFSError, match="No IPFS nodes available"):
+                manager.upload(b"data")
+
+        with patch("citrate_sdk.ipfs.time.monotonic", return_value=1000.0 + 31):
+            assert manager.upload(b"data") == "QmTestHash"
+
+    def test_download_is_hedged_to_next_node(self):
+        """Test a slow node is raced against the next node after the hedge delay"""
+        manager = self._manager()
+        manager.hedge_delay = 0.01
+        primary, fallback = manager.primary, manager.fallbacks[0]
+        released = threading.Event()
+        primary.is_available.return_value = True
+        primary.download_bytes.side_effect = lambda _: released.wait(5) and b"slow"
+        fallback.is_available.return_value = True
+        fallback.download_bytes.return_value = b"fast"
+
+        try:
+            assert manager.download("QmTestHash") == b"fast"
+        finally:
+            released.set()
+
+        fallback.download_bytes.assert_called_once_with("QmTestHash")
+
+    def test_download_failure_starts_next_node_immediately(self):
+        """Test a failed attempt does not wait for the hedge delay"""
+        manager = self._manager()
+        manager.hedge_delay = 5
+        primary, fallback = manager.primary, manager.fallbacks[0]
+        primary.is_available.return_value = True
+        primary.download_bytes.side_effect = IPFSError("not found")
+        fallback.is_available.return_value = True
+        fallback.download_bytes.return_value = b"data"
+
+        assert manager.download("QmTestHash") == b"data"
+
+    def test_download_all_nodes_fail(self):
+        """Test the last node error is raised when every node fails"""
+        manager = self._manager()
+        for client in [manager.primary] + manager.fallbacks:
+            client.is_available.return_value = True
+            client.download_bytes.side_effect = IPFSError("not found")
+
+        with pytest.raises(IPFSError, match="not found"):
+            manager.download("QmTestHash")
+
+    def test_download_is_cached_by_cid(self):
+        """Test repeated downloads of a CID are served from the cache"""
+        manager = self._manager(fallback_count=0)
+        manager.primary.is_available.return_value = True
+        manager.primary.download_bytes.return_value = b"weights"
+
+        assert manager.download("QmTestHash") == b"weights"
+        assert manager.download("QmTestHash") == b"weights"
+
+        manager.primary.download_bytes.assert_called_once()
+
+    def test_download_cache_evicts_least_recently_used(self):
+        """Test the cache stays within its byte budget"""
+        manager = self._manager(fallback_count=0)
+        manager.cache_max_bytes = 8
+        manager.primary.is_available.return_value = True
+        manager.primary.download_bytes.side_effect = lambda h: h.encode() * 2
+
+        manager.download("aa")
+        manager.download("bb")
+        manager.download("aa")
+        manager.download("cc")
+
+        assert list(manager._cache) == ["aa", "cc"]
+        assert manager._cache_bytes == 8
+
+    def test_replication_does_not_block_upload(self):
+        """Test pins to secondary nodes run in the background"""
+        manager = self._manager(fallback_count=2)
+        released = threading.Event()
+        manager.primary.is_available.return_value = True
+        manager.primary.upload_bytes.return_value = "QmTestHash"
+        for fallback in manager.fallbacks:
+            fallback.is_available.return_value = True
+            fallback.pin_file.side_effect = lambda _: released.wait(5)
+
+        try:
+            assert manager.upload(b"data") == "QmTestHash"
+            assert len(manager._pending_replications) == 2
+        finally:
+            released.set()
+
+        manager.wait_for_replication(timeout=5)
+        for fallback in manager.fallbacks:
+            fallback.pin_file.assert_called_once_with("QmTestHash")
+        assert manager._pending_replications == []
+
+    def test_clients_share_one_session(self):
+        """Test all nodes reuse the manager's connection pool"""
+        manager = IPFSManager("http://primary:5001", ["http://fallback:5001"])
+
+        assert manager.primary.session is manager.session
+        assert manager.fallbacks[0].session is manager.session
+
+        with patch.object(manager.session, "close") as mock_close:
+            manager.primary.close()
+            mock_close.assert_not_called()
+            manager.close()
+            mock_close.assert_called_once()
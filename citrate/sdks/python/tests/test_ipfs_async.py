@@ -0,0 +1,117 @@
+"""
+Unit tests for Citrate SDK async IPFS module
+"""
+
+import asyncio
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from citrate_sdk.ipfs import _HEDGE_UPLOAD_MAX_BYTES
+from citrate_sdk.ipfs_async import AsyncIPFSClient, AsyncIPFSManager
+from citrate_sdk.errors import IPFSError
+
+
+def _transport(routes):
+    """Build an httpx mock transport answering by (host, path)"""
+    def handler(request):
+        return routes[(request.url.host, request.url.path)](request)
+    return httpx.MockTransport(handler)
+
+
+class TestAsyncIPFSClient:
+    """Test cases for AsyncIPFSClient"""
+
+    def test_upload_and_download(self):
+        """Test upload returns the CID and download returns the content"""
+        transport = _transport({
+            ("localhost", "/api/v0/add"): lambda r: httpx.Response(200, json={"Hash": "QmTestHash"}),
+            ("localhost", "/api/v0/cat"): lambda r: httpx.Response(200, content=b"weights"),
+        })
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport) as http:
+                client = AsyncIPFSClient("http://localhost:5001", client=http)
+                return await client.upload_bytes(b"weights"), await client.download_bytes("QmTestHash")
+
+        assert asyncio.run(run()) == ("QmTestHash", b"weights")
+
+    def test_upload_http_error(self):
+        """Test non-200 upload responses raise IPFSError"""
+        transport = _transport({
+            ("localhost", "/api/v0/add"): lambda r: httpx.Response(500),
+        })
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport) as http:
+                await AsyncIPFSClient("http://localhost:5001", client=http).upload_bytes(b"data")
+
+        with pytest.raises(IPFSError, match="HTTP 500"):
+            asyncio.run(run())
+
+
+class TestAsyncIPFSManager:
+    """Test cases for AsyncIPFSManager"""
+
+    def test_download_falls_back_and_caches(self):
+        """Test a failing primary is hedged to the fallback and the result cached"""
+        calls = []
+
+        def cat(status, content):
+            def respond(request):
+                calls.append(request.url.host)
+                return httpx.Response(status, content=content)
+            return respond
+
+        transport = _transport({
+            ("primary", "/api/v0/version"): lambda r: httpx.Response(200, json={}),
+            ("primary", "/api/v0/cat"): cat(404, b""),
+            ("fallback", "/api/v0/version"): lambda r: httpx.Response(200, json={}),
+            ("fallback", "/api/v0/cat"): cat(200, b"weights"),
+        })
+
+        async def run():
+            manager = AsyncIPFSManager("http://primary:5001", ["http://fallback:5001"])
+            await manager.primary.client.aclose()
+            http = httpx.AsyncClient(transport=transport)
+            manager.primary.client = http
+            manager.fallbacks[0].client = http
+            async with manager:
+                first = await manager.download("QmTestHash")
+                second = await manager.download("QmTestHash")
+            return first, second
+
+        assert asyncio.run(run()) == (b"weights", b"weights")
+        assert calls == ["primary", "fallback"]
+
+    def test_large_upload_not_hedged(self):
+        """Test payloads over the hedge limit go to one node, even with no hedge delay"""
+        adds = []
+
+        async def add(request):
+            adds.append(request.url.host)
+            # A slow primary would trigger a hedge to the fallback
+            if request.url.host == "primary":
+                await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"Hash": "QmLarge"})
+
+        transport = _transport({
+            ("primary", "/api/v0/version"): lambda r: httpx.Response(200, json={}),
+            ("primary", "/api/v0/add"): add,
+            ("fallback", "/api/v0/version"): lambda r: httpx.Response(200, json={}),
+            ("fallback", "/api/v0/add"): add,
+            ("fallback", "/api/v0/pin/add"): lambda r: httpx.Response(200, json={}),
+        })
+
+        async def run():
+            manager = AsyncIPFSManager("http://primary:5001", ["http://fallback:5001"],
+                                       hedge_delay_ms=0)
+            await manager.primary.client.aclose()
+            http = httpx.AsyncClient(transport=transport)
+            manager.primary.client = http
+            manager.fallbacks[0].client = http
+            async with manager:
+                return await manager.upload(b"x" * (_HEDGE_UPLOAD_MAX_BYTES + 1))
+
+        assert asyncio.run(run()) == "QmLarge"
+        assert adds == ["primary"]
@@ -4,12 +4,48 @@ Verify Metal GPU execution is working correctly
 Tests CoreML model execution on Apple Silicon
 """
 
+import functools
+import hashlib
+import os
+import re
 import sys
 import platform
 import subprocess
+import threading
 import json
+import shutil
 from pathlib import Path
 
+# Input shapes the benchmark model is compiled for; the ANE only accepts
+# static shapes, so batch sizes are enumerated rather than ranged
+BENCH_SHAPES = [(1, 512), (8, 512), (64, 512)]
+
+# Batch size for the batched benchmark (one of BENCH_SHAPES)
+BENCH_BATCH = 64
+
+# Where traced TorchScript models and converted CoreML models are cached
+TRACE_CACHE_DIR = Path("/tmp")
+MODEL_CACHE_DIR = Path("/tmp")
+
+# powermetrics sampling window used to see which engine draws power
+POWER_SAMPLE_INTERVAL_MS = 100
+POWER_SAMPLE_COUNT = 20
+
+# Average rail power (mW) above which an engine counts as doing the work
+POWER_ACTIVE_MW = 50
+
+POWER_LINE = re.compile(r"^(CPU|GPU|ANE) Power: (\d+) mW", re.MULTILINE)
+
+@functools.lru_cache(maxsize=1)
+def hardware_overview():
+    """Return system_profiler's hardware overview (takes ~1s, so run once)."""
+
+    return subprocess.run(
+        ["system_profiler", "SPHardwareDataType"],
+        capture_output=True,
+        text=True
+    ).stdout
+
 def check_system():
     """Check if system supports Metal GPU."""
 
@@ -29,13 +65,7 @@ def check_system():
         return False
 
     # Get chip info
-    chip_info = subprocess.run(
-        ["system_profiler", "SPHardwareDataType"],
-        capture_output=True,
-        text=True
-    ).stdout
-
-    for line in chip_info.split("\n"):
+    for line in hardware_overview().split("\n"):
         if "Chip:" in line:
             chip = line.split(":")[1].strip()
             print(f"✅ Apple Silicon: {chip}")
@@ -51,6 +81,70 @@ def check_system():
 
     return True
 
+def load_traced(model, example_input):
+    """
+    Load a cached TorchScript trace of model, tracing and saving it on a miss.
+
+    The cache is keyed by the model's architecture and input shape; the test
+    models have random weights, so reusing an earlier trace's weights is fine.
+    """
+
+    import torch
+
+    key = hashlib.blake2b(f"{model!r}{tuple(example_input.shape)}".encode(),
+                          digest_size=8).hexdigest()
+    cache_path = TRACE_CACHE_DIR / f"citrate_traced_{key}.pt"
+    if cache_path.exists():
+        return torch.jit.load(str(cache_path))
+
+    # check_trace would run the model a second time just to compare outputs
+    traced = torch.jit.trace(model, example_input, strict=False, check_trace=False)
+    torch.jit.save(traced, str(cache_path))
+    return traced
+
+def convert_cached(traced, convert):
+    """
+    Convert a traced model with convert(traced), reusing an earlier result.
+
+    The mlpackage is stored at a path derived from the traced model's bytes,
+    the conversion code, BENCH_SHAPES and the coremltools version, so conversion (the
+    slowest step) and saving are skipped when nothing changed.
+
+    Returns:
+        (mlpackage path, compiled .mlmodelc path)
+    """
+
+    import inspect
+    import io
+    import torch
+    import coremltools as ct
+
+    buf = io.BytesIO()
+    torch.jit.save(traced, buf)
+    key = hashlib.blake2b(buf.getvalue(), digest_size=8)
+    key.update(inspect.getsource(convert).encode())
+    key.update(repr(BENCH_SHAPES).encode())
+    key.update(ct.__version__.encode())
+
+    package_path = MODEL_CACHE_DIR / f"ct_{key.hexdigest()}.mlpackage"
+    compiled_path = package_path.with_suffix(".mlmodelc")
+    if not (package_path.exists() and compiled_path.exists()):
+        compile_model(convert(traced), package_path)
+
+    return package_path, compiled_path
+
+def compile_model(mlmodel, package_path):
+    """Save an mlprogram and keep its compiled .mlmodelc for fast reloads."""
+
+    mlmodel.save(str(package_path))
+
+    # ct.convert already compiled the model to a temporary .mlmodelc; keep a
+    # copy so later loads skip the compile/specialize step on first predict
+    compiled_path = package_path.with_suffix(".mlmodelc")
+    shutil.rmtree(compiled_path, ignore_errors=True)
+    shutil.copytree(mlmodel.get_compiled_model_path(), compiled_path)
+    return compiled_path
+
 def test_coreml_inference():
     """Test actual CoreML inference."""
 
@@ -76,26 +170,28 @@ def test_coreml_inference():
         model = SimpleModel()
         model.eval()
 
-        # Trace model
+        # Trace model (cached across runs)
         dummy_input = torch.randn(1, 10)
-        traced = torch.jit.trace(model, dummy_input)
+        traced = load_traced(model, dummy_input)
 
         # Convert to CoreML
         print("Converting to CoreML...")
-        mlmodel = ct.convert(
-            traced,
-            convert_to="mlprogram",
-            inputs=[ct.TensorType(shape=(1, 10))],
-            compute_units=ct.ComputeUnit.ALL
-        )
 
-        # Save and load
-        test_path = Path("/tmp/test_model.mlpackage")
-        mlmodel.save(str(test_path))
+        def convert(traced):
+            return ct.convert(
+                traced,
+                convert_to="mlprogram",
+                inputs=[ct.TensorType(shape=(1, 10))],
+                compute_precision=ct.precision.FLOAT16,
+                compute_units=ct.ComputeUnit.ALL
+            )
+
+        # Convert (or reuse the cached conversion) and load the compiled model
+        _, compiled_path = convert_cached(traced, convert)
 
         # Test inference
         print("Running inference...")
-        loaded = ct.models.MLModel(str(test_path))
+        loaded = ct.models.CompiledMLModel(str(compiled_path))
 
         # Prepare input
         test_input = {"x": np.random.randn(1, 10).astype(np.float32)}
@@ -107,7 +203,6 @@ def test_coreml_inference():
         print(f"   Output shape: {result['linear_0'].shape}")
 
         # Check compute unit
-        spec = loaded.get_spec()
         print(f"   Compute units: ALL (Neural Engine + GPU)")
 
         return True
@@ -116,6 +211,113 @@ def test_coreml_inference():
         print(f"❌ CoreML test failed: {e}")
         return False
 
+def benchmark_model(loaded, test_input, batch_input):
+    """
+    Time single-sample and batched predictions, returning ms per sample.
+
+    Also returns the cold latency of the first predict after loading, which
+    is what a user's first query sees.
+    """
+
+    import time
+    import numpy as np
+
+    # Warm up every compiled shape, since each is specialized on first use;
+    # the very first call measures cold latency
+    cold_ms = None
+    for shape in BENCH_SHAPES:
+        warmup_input = {"x": np.zeros(shape, dtype=np.float32)}
+        for _ in range(3):
+            start = time.perf_counter_ns()
+            _ = loaded.predict(warmup_input)
+            if cold_ms is None:
+                cold_ms = (time.perf_counter_ns() - start) / 1e6
+
+    # Actual benchmark; integer nanosecond timestamps avoid float rounding
+    # on sub-millisecond samples
+    times = np.empty(100, dtype=np.float64)
+    for i in range(len(times)):
+        start = time.perf_counter_ns()
+        _ = loaded.predict(test_input)
+        times[i] = time.perf_counter_ns() - start
+
+    # Batched benchmark: one predict call per BENCH_BATCH samples amortizes
+    # the per-call Python/CoreML dispatch cost
+    batch_times = np.empty(10, dtype=np.float64)
+    for i in range(len(batch_times)):
+        start = time.perf_counter_ns()
+        _ = loaded.predict(batch_input)
+        batch_times[i] = time.perf_counter_ns() - start
+
+    # Convert to ms (per sample for the batched run)
+    return times / 1e6, batch_times / (1e6 * BENCH_BATCH), cold_ms
+
+def count_fp16_ops(spec):
+    """Count mlprogram ops, and those producing fp16 tensors."""
+
+    from coremltools.proto import MIL_pb2
+
+    total = fp16 = 0
+    for function in spec.mlProgram.functions.values():
+        for block in function.block_specializations.values():
+            for op in block.operations:
+                total += 1
+                if any(output.type.tensorType.dataType == MIL_pb2.FLOAT16
+                       for output in op.outputs):
+                    fp16 += 1
+
+    return total, fp16
+
+def measure_power(loaded, test_input):
+    """
+    Run predictions while powermetrics samples the CPU, GPU and ANE rails.
+
+    Returns the average power per rail in mW, or None when powermetrics
+    cannot run (it requires root).
+    """
+
+    if os.geteuid() != 0 or shutil.which("powermetrics") is None:
+        return None
+
+    proc = subprocess.Popen(
+        ["powermetrics", "-i", str(POWER_SAMPLE_INTERVAL_MS), "-n", str(POWER_SAMPLE_COUNT),
+         "--samplers", "cpu_power,gpu_power,ane_power"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True
+    )
+
+    # Keep the model busy from a worker thread while this thread drains the
+    # pipe; per-core cpu_power output can fill it and stall powermetrics
+    done = threading.Event()
+
+    def keep_busy():
+        while not done.is_set():
+            _ = loaded.predict(test_input)
+
+    worker = threading.Thread(target=keep_busy, daemon=True)
+    worker.start()
+    try:
+        output, _ = proc.communicate()
+    finally:
+        done.set()
+        worker.join()
+
+    samples = {}
+    for rail, mw in POWER_LINE.findall(output):
+        samples.setdefault(rail, []).append(int(mw))
+
+    return {rail: sum(values) / len(values) for rail, values in samples.items()}
+
+def classify_residency(power):
+    """Name the accelerator drawing the most power, or the CPU if neither is active."""
+
+    active = {rail: mw for rail, mw in power.items()
+              if rail in ("ANE", "GPU") and mw >= POWER_ACTIVE_MW}
+    if not active:
+        return "CPU-resident"
+    return f"{max(active, key=active.get)}-resident"
+
 def verify_metal_performance():
     """Verify Metal performance characteristics."""
 
@@ -123,10 +325,14 @@ def verify_metal_performance():
     print("=" * 40)
 
     try:
-        import time
         import torch
         import coremltools as ct
         import numpy as np
+        from coremltools.optimize.coreml import (
+            OpLinearQuantizerConfig,
+            OptimizationConfig,
+            linear_quantize_weights,
+        )
 
         # Create a larger model for benchmarking
         class BenchmarkModel(torch.nn.Module):
@@ -148,54 +354,84 @@ def verify_metal_performance():
 
         # Convert to CoreML
         dummy_input = torch.randn(1, 512)
-        traced = torch.jit.trace(model, dummy_input)
-
-        mlmodel = ct.convert(
-            traced,
-            convert_to="mlprogram",
-            inputs=[ct.TensorType(shape=(1, 512))],
-            compute_units=ct.ComputeUnit.ALL
-        )
+        traced = load_traced(model, dummy_input)
+
+        def convert(traced):
+            # Enumerated batch sizes so one predict call can cover many samples
+            # while every shape stays static enough for the Neural Engine
+            mlmodel = ct.convert(
+                traced,
+                convert_to="mlprogram",
+                inputs=[ct.TensorType(name="x", shape=ct.EnumeratedShapes(shapes=BENCH_SHAPES))],
+                compute_precision=ct.precision.FLOAT16,
+                compute_units=ct.ComputeUnit.CPU_AND_NE,
+                # iOS 17 / macOS 14 opset: needed for weight quantization and
+                # gives the ANE compiler its newest op set
+                minimum_deployment_target=ct.target.iOS17
+            )
+
+            # 8-bit weights halve the bytes moved per inference again over fp16
+            return linear_quantize_weights(mlmodel, config=OptimizationConfig(
+                global_config=OpLinearQuantizerConfig(mode="linear_symmetric", dtype="int8")
+            ))
+
+        # Convert (or reuse the cached conversion) and compile once, then load
+        # once per compute unit so each engine is measured on its own instead
+        # of CoreML silently picking one under ALL
+        package_path, compiled_path = convert_cached(traced, convert)
+
+        # Build the inputs once so allocation and RNG cost stay out of the timings
+        test_input = {"x": np.random.randn(1, 512).astype(np.float32)}
+        batch_input = {"x": np.random.randn(BENCH_BATCH, 512).astype(np.float32)}
 
-        # Save and load
-        bench_path = Path("/tmp/benchmark_model.mlpackage")
-        mlmodel.save(str(bench_path))
-        loaded = ct.models.MLModel(str(bench_path))
-
-        # Benchmark
         print("Running performance benchmark...")
 
-        # Warmup
-        for _ in range(10):
-            test_input = {"x": np.random.randn(1, 512).astype(np.float32)}
-            _ = loaded.predict(test_input)
-
-        # Actual benchmark
-        times = []
-        for _ in range(100):
-            test_input = {"x": np.random.randn(1, 512).astype(np.float32)}
+        spec = ct.models.MLModel(str(package_path), skip_model_load=True).get_spec()
+        total_ops, fp16_ops = count_fp16_ops(spec)
+        print(f"   fp16 ops: {fp16_ops}/{total_ops}")
 
-            start = time.perf_counter()
-            _ = loaded.predict(test_input)
-            end = time.perf_counter()
-
-            times.append((end - start) * 1000)  # Convert to ms
+        results = {}
+        residency = {}
+        for name, unit in [("CPU_AND_NE", ct.ComputeUnit.CPU_AND_NE),
+                           ("CPU_AND_GPU", ct.ComputeUnit.CPU_AND_GPU),
+                           ("ALL", ct.ComputeUnit.ALL)]:
+            loaded = ct.models.CompiledMLModel(str(compiled_path), compute_units=unit)
+            times, batch_times, cold_ms = benchmark_model(loaded, test_input, batch_input)
+            p95 = np.percentile(times, 95)
+            results[name] = (times.mean(), p95, batch_times.mean(), cold_ms)
 
-        avg_time = np.mean(times)
-        min_time = np.min(times)
-        max_time = np.max(times)
-        p95_time = np.percentile(times, 95)
+            power = measure_power(loaded, test_input)
+            if power is not None:
+                residency[name] = (classify_residency(power), power)
 
         print(f"✅ Performance Results:")
-        print(f"   Average: {avg_time:.2f}ms")
-        print(f"   Min: {min_time:.2f}ms")
-        print(f"   Max: {max_time:.2f}ms")
-        print(f"   P95: {p95_time:.2f}ms")
-        print(f"   Throughput: {1000/avg_time:.1f} inferences/sec")
+        for name, (avg, p95, per_sample, cold) in results.items():
+            print(f"   {name:<12} cold {cold:.2f}ms  warm avg {avg:.2f}ms  p95 {p95:.2f}ms  "
+                  f"batched (x{BENCH_BATCH}) {per_sample:.3f}ms/sample")
+
+        best = min(results, key=lambda name: results[name][0])
+        avg_time = results[best][0]
+        print(f"   Fastest: {best} ({1000/avg_time:.1f} inferences/sec)")
+
+        # Verify it's using Metal from which rail draws power, when available
+        if residency:
+            print("   Residency (powermetrics):")
+            for name, (where, power) in residency.items():
+                rails = ", ".join(f"{rail} {mw:.0f}mW" for rail, mw in sorted(power.items()))
+                print(f"   {name:<12} {where} ({rails})")
+
+            accelerated = [name for name, (where, _) in residency.items()
+                           if where != "CPU-resident"]
+            if accelerated:
+                print(f"✅ Metal/ANE acceleration confirmed for {', '.join(accelerated)}")
+                return True
+            print("⚠️  Only the CPU rail drew power during inference")
+            return False
 
-        # Verify it's using Metal
+        # Without root powermetrics cannot run; fall back to the latency proxy
+        print("   (run as root to measure engine residency with powermetrics)")
         if avg_time < 10:  # Should be fast on Metal
-            print("✅ Metal acceleration confirmed (< 10ms latency)")
+            print("✅ Metal acceleration likely (< 10ms latency)")
             return True
         else:
             print("⚠️  Performance suggests CPU execution")
@@ -6,14 +6,67 @@ Creates multiple format variants (SafeTensors, GGUF, MLX) for cross-platform sup
 """
 
 import argparse
+import importlib.util
 import json
 import os
+import secrets
+import shutil
 import subprocess
 import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
 import hashlib
 
+import requests
+
+# Read size for hashing model files; multi-GB shards need large reads so the
+# loop is not bound by per-chunk interpreter and syscall overhead
+HASH_CHUNK_SIZE = 1 << 20
+
+# Converted formats, keyed by a hash of the SafeTensors they were made from
+CONVERSION_CACHE_DIR = Path("./model_deployment_cache")
+
+# Lines of a failed tool's stderr kept for the error report
+STDERR_TAIL_LINES = 50
+
+# Parallel file downloads from the HuggingFace Hub
+HF_MAX_WORKERS = 16
+
+# GGUF quantization types written directly by the llama.cpp converter
+GGUF_DIRECT_OUTTYPES = {"Q8_0": "q8_0", "F16": "f16", "BF16": "bf16", "F32": "f32"}
+
+# llama.cpp quantization type for each GGUF format
+GGUF_QUANT_TYPES = {"gguf_q4": "Q4_K_M", "gguf_q8": "Q8_0"}
+
+# MLX quantization bit width for each MLX format
+MLX_QUANT_BITS = {"mlx": 4, "mlx_q8": 8}
+
+# Weights per quantization scale/bias group for MLX conversions
+MLX_Q_GROUP_SIZE = 64
+
+# RAM-backed directory for large intermediates, where available (Linux)
+RAM_DISK = Path("/dev/shm")
+
+# IPFS HTTP API used for uploads (the daemon started by `ipfs daemon`)
+IPFS_API_URL = os.environ.get("IPFS_API_URL", "http://127.0.0.1:5001")
+
+# CIDv1 with raw leaves and 1 MiB chunks: 4x fewer DAG nodes than the CLI's
+# default 256 KiB protobuf-wrapped leaves
+IPFS_ADD_PARAMS = {
+    "cid-version": "1",
+    "raw-leaves": "true",
+    "chunker": "size-1048576",
+    "pin": "true",
+    "quieter": "true",
+}
+
+# Read size for streaming files into the upload body
+IPFS_UPLOAD_CHUNK_SIZE = 1 << 20
+
 # Modern model catalog (2024-2025)
 SUPPORTED_MODELS = {
     "llama-3.1-8b-instruct": {
@@ -125,10 +178,13 @@ def check_dependencies():
         "mlx": "For Apple Silicon optimization: pip install mlx mlx-lm",
     }
 
+    # One PATH lookup per tool, without spawning `which` for each
+    found = {cmd: shutil.which(cmd.split()[0]) for cmd in {**required, **optional}}
+
     missing = []
 
     for cmd, install in required.items():
-        if subprocess.run(["which", cmd], capture_output=True).returncode != 0:
+        if found[cmd] is None:
             print(f"   ❌ {cmd} not found. Install: {install}")
             missing.append(cmd)
         else:
@@ -136,7 +192,7 @@ def check_dependencies():
 
     print("\nOptional tools:")
     for cmd, install in optional.items():
-        if subprocess.run(["which", cmd.split()[0]], capture_output=True).returncode != 0:
+        if found[cmd] is None:
             print(f"   ⚠️  {cmd} not found. {install}")
         else:
             print(f"   ✅ {cmd} found")
@@ -149,6 +205,26 @@ def check_dependencies():
     return True
 
 
+def run_quiet(cmd: List[str]):
+    """
+    Run a long-running tool, discarding stdout and keeping only the tail of stderr.
+
+    stderr is drained line by line as the tool runs, so a chatty converter
+    can neither fill the pipe and stall nor grow memory without bound.
+
+    Raises:
+        subprocess.CalledProcessError: With the stderr tail, if the tool fails
+    """
+    tail = deque(maxlen=STDERR_TAIL_LINES)
+    with subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          text=True, errors="replace") as proc:
+        for line in proc.stderr:
+            tail.append(line)
+
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr="".join(tail))
+
+
 def download_from_huggingface(model_id: str, output_dir: Path, token: Optional[str] = None) -> Path:
     """Download model from HuggingFace in SafeTensors format."""
     print(f"\n📥 Downloading {model_id} from HuggingFace...")
@@ -161,17 +237,27 @@ def download_from_huggingface(model_id: str, output_dir: Path, token: Optional[s
         model_id,
         "--local-dir", str(output_dir),
         "--local-dir-use-symlinks", "False",
+        "--max-workers", str(HF_MAX_WORKERS),
     ]
 
     if token:
         cmd.extend(["--token", token])
 
+    # hf_transfer downloads each shard over many connections from Rust; the
+    # hub errors if it is enabled without the package, so only set it then
+    env = os.environ.copy()
+    if importlib.util.find_spec("hf_transfer") is not None:
+        env["HF_HUB_ENABLE_HF_TRANSFER"] = "1"
+    else:
+        print("   ℹ️  pip install hf_transfer for faster downloads")
+
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        # Not captured, so the CLI's progress bars stay visible
+        subprocess.run(cmd, check=True, env=env)
         print(f"   ✅ Downloaded to {output_dir}")
         return output_dir
     except subprocess.CalledProcessError as e:
-        print(f"   ❌ Download failed: {e.stderr}")
+        print(f"   ❌ Download failed: {e}")
         raise
 
 
@@ -188,36 +274,62 @@ def convert_to_gguf(model_dir: Path, output_dir: Path, quantization: str = "Q4_K
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Newer llama.cpp checkouts renamed convert.py
+    convert_script = llama_cpp_path / "convert_hf_to_gguf.py"
+    if not convert_script.exists():
+        convert_script = llama_cpp_path / "convert.py"
+
+    quant_path = output_dir / f"model-{quantization}.gguf"
+
     try:
-        # Step 1: Convert to GGUF fp16
-        fp16_path = output_dir / "model-fp16.gguf"
-        print("   → Converting to fp16 GGUF...")
-        subprocess.run([
-            "python3",
-            str(llama_cpp_path / "convert.py"),
-            str(model_dir),
-            "--outfile", str(fp16_path),
-            "--outtype", "f16",
-        ], check=True, capture_output=True)
-
-        # Step 2: Quantize
-        quant_path = output_dir / f"model-{quantization}.gguf"
-        print(f"   → Quantizing to {quantization}...")
-        subprocess.run([
-            str(llama_cpp_path / "quantize"),
-            str(fp16_path),
-            str(quant_path),
-            quantization,
-        ], check=True, capture_output=True)
-
-        # Remove intermediate fp16 file
-        fp16_path.unlink()
+        # Types the converter writes itself need no fp16 intermediate
+        if quantization in GGUF_DIRECT_OUTTYPES:
+            print(f"   → Converting directly to {quantization} GGUF...")
+            run_quiet([
+                "python3",
+                str(convert_script),
+                str(model_dir),
+                "--outfile", str(quant_path),
+                "--outtype", GGUF_DIRECT_OUTTYPES[quantization],
+            ])
+
+            print(f"   ✅ Created GGUF: {quant_path}")
+            return quant_path
+
+        # Keep the fp16 intermediate in RAM when it fits, saving a full
+        # model-sized disk write and read
+        model_bytes = sum(p.stat().st_size for p in model_dir.rglob('*.safetensors'))
+        tmp_root = None
+        if RAM_DISK.is_dir() and shutil.disk_usage(RAM_DISK).free > model_bytes * 1.1:
+            tmp_root = RAM_DISK
+
+        with tempfile.TemporaryDirectory(dir=tmp_root or output_dir) as tmp_dir:
+            # Step 1: Convert to GGUF fp16
+            fp16_path = Path(tmp_dir) / "model-fp16.gguf"
+            print("   → Converting to fp16 GGUF...")
+            run_quiet([
+                "python3",
+                str(convert_script),
+                str(model_dir),
+                "--outfile", str(fp16_path),
+                "--outtype", "f16",
+            ])
+
+            # Step 2: Quantize, using every core
+            print(f"   → Quantizing to {quantization}...")
+            run_quiet([
+                str(llama_cpp_path / "quantize"),
+                str(fp16_path),
+                str(quant_path),
+                quantization,
+                str(os.cpu_count() or 1),
+            ])
 
         print(f"   ✅ Created GGUF: {quant_path}")
         return quant_path
 
     except subprocess.CalledProcessError as e:
-        print(f"   ❌ GGUF conversion failed: {e}")
+        print(f"   ❌ GGUF conversion failed: {e}\n{e.stderr}")
         return None
 
 
@@ -230,18 +342,17 @@ def convert_to_mlx(model_dir: Path, output_dir: Path, quantization: int = 4) ->
 
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Use mlx_lm to convert and quantize
+        # Use mlx_lm to convert and quantize at the requested bit width
         cmd = [
             "python3", "-m", "mlx_lm.convert",
             "--hf-path", str(model_dir),
             "--mlx-path", str(output_dir),
             "--quantize",
+            "--q-bits", str(quantization),
+            "--q-group-size", str(MLX_Q_GROUP_SIZE),
         ]
 
-        if quantization == 4:
-            cmd.append("-q")
-
-        subprocess.run(cmd, check=True, capture_output=True)
+        run_quiet(cmd)
         print(f"   ✅ Created MLX model: {output_dir}")
         return output_dir
 
@@ -249,50 +360,147 @@ def convert_to_mlx(model_dir: Path, output_dir: Path, quantization: int = 4) ->
         print("   ⚠️  mlx-lm not installed. Skipping MLX conversion.")
         print("      Install: pip install mlx mlx-lm")
         return None
+    except subprocess.CalledProcessError as e:
+        print(f"   ❌ MLX conversion failed: {e}\n{e.stderr}")
+        return None
     except Exception as e:
         print(f"   ❌ MLX conversion failed: {e}")
         return None
 
 
-def calculate_hash(file_path: Path) -> str:
-    """Calculate SHA256 hash of a file or directory."""
+def _update_from_file(sha256, file_path: Path):
+    """Feed a file's bytes into a running hash using large unbuffered reads."""
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    with open(file_path, 'rb', buffering=0) as f:
+        while n := f.readinto(buf):
+            sha256.update(view[:n])
+
+
+def _sha256_file(file_path: Path) -> bytes:
+    """Calculate the SHA256 digest of a single file."""
+    # file_digest (Python 3.11+) streams the file in C without the GIL
+    if hasattr(hashlib, "file_digest"):
+        with open(file_path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').digest()
+
     sha256 = hashlib.sha256()
+    _update_from_file(sha256, file_path)
+    return sha256.digest()
+
+
+def calculate_hash(file_path: Path) -> str:
+    """
+    Calculate SHA256 hash of a file or directory.
 
+    A directory hashes to the SHA256 over each file's relative path and
+    digest, in sorted path order. Files are hashed in parallel threads;
+    hashlib releases the GIL while hashing, so shards hash on separate cores.
+    """
     if file_path.is_file():
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
-    else:
-        # Hash all files in directory
-        for file in sorted(file_path.rglob('*')):
-            if file.is_file():
-                with open(file, 'rb') as f:
-                    for chunk in iter(lambda: f.read(4096), b''):
-                        sha256.update(chunk)
+        return _sha256_file(file_path).hex()
+
+    files = sorted(p for p in file_path.rglob('*') if p.is_file())
+    with ThreadPoolExecutor(max_workers=max(1, min(len(files), os.cpu_count() or 1))) as ex:
+        digests = dict(zip(files, ex.map(_sha256_file, files)))
+
+    return _combine_digests(file_path, digests)
+
+
+def _combine_digests(root: Path, digests: Dict[Path, bytes]) -> str:
+    """Combine per-file digests into a directory hash, in sorted path order."""
+    sha256 = hashlib.sha256()
+    for file in sorted(digests):
+        # NUL cannot appear in a path, so path/digest pairs stay unambiguous
+        sha256.update(file.relative_to(root).as_posix().encode() + b"\0" + digests[file])
 
     return sha256.hexdigest()
 
 
-def upload_to_ipfs(path: Path) -> str:
-    """Upload file or directory to IPFS."""
+def _multipart_body(path: Path, boundary: str, digests: Optional[Dict[Path, bytes]] = None):
+    """
+    Yield a multipart/form-data body for a file or directory tree, streaming file contents.
+
+    If digests is given, each file's SHA256 is computed from the same reads
+    and stored in it once the file has been fully sent.
+    """
+    if path.is_file():
+        entries = [(path.name, path)]
+    else:
+        entries = [(path.name, None)] + [
+            (f"{path.name}/{p.relative_to(path).as_posix()}", p if p.is_file() else None)
+            for p in sorted(path.rglob('*'))
+        ]
+
+    buf = bytearray(IPFS_UPLOAD_CHUNK_SIZE)
+    view = memoryview(buf)
+
+    for name, file in entries:
+        content_type = "application/octet-stream" if file else "application/x-directory"
+        yield (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{quote(name, safe="")}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+
+        if file:
+            sha256 = hashlib.sha256()
+            with open(file, 'rb', buffering=0) as f:
+                while n := f.readinto(buf):
+                    if digests is not None:
+                        sha256.update(view[:n])
+                    # The consumer sends each chunk before asking for the next,
+                    # so the buffer can be reused
+                    yield view[:n]
+
+            if digests is not None:
+                digests[file] = sha256.digest()
+
+        yield b"\r\n"
+
+    yield f"--{boundary}--\r\n".encode()
+
+
+def upload_to_ipfs(path: Path, digests: Optional[Dict[Path, bytes]] = None) -> str:
+    """Upload file or directory to IPFS through the node's HTTP API."""
     print(f"\n📤 Uploading {path.name} to IPFS...")
 
-    try:
-        if path.is_dir():
-            cmd = ["ipfs", "add", "-r", "-Q", str(path)]
-        else:
-            cmd = ["ipfs", "add", "-Q", str(path)]
+    boundary = secrets.token_hex(16)
 
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        cid = result.stdout.strip()
+    try:
+        response = requests.post(
+            f"{IPFS_API_URL}/api/v0/add",
+            params=IPFS_ADD_PARAMS,
+            data=_multipart_body(path, boundary, digests),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+        response.raise_for_status()
+
+        # quieter=true reports only the root of the added tree
+        cid = json.loads(response.text.strip().splitlines()[-1])["Hash"]
         print(f"   ✅ Uploaded: {cid}")
         return cid
 
-    except subprocess.CalledProcessError as e:
-        print(f"   ❌ IPFS upload failed: {e.stderr}")
+    except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+        print(f"   ❌ IPFS upload failed: {e}")
         raise
 
 
+def hash_and_upload(path: Path) -> Tuple[str, str]:
+    """
+    Upload a file or directory to IPFS and hash it in the same read pass.
+
+    Returns:
+        (IPFS CID, SHA256 hex digest matching calculate_hash)
+    """
+    digests: Dict[Path, bytes] = {}
+    cid = upload_to_ipfs(path, digests)
+
+    if path.is_file():
+        return cid, digests[path].hex()
+    return cid, _combine_digests(path, digests)
+
+
 def create_model_metadata(
     model_key: str,
     model_info: Dict,
@@ -323,6 +531,22 @@ def create_model_metadata(
     return metadata
 
 
+def load_conversion_manifest(cache_dir: Path) -> Dict[str, str]:
+    """Load the format -> relative output path manifest of a conversion cache entry."""
+    manifest_path = cache_dir / "manifest.json"
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def save_conversion_manifest(cache_dir: Path, manifest: Dict[str, str]):
+    """Save the manifest of a conversion cache entry."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(cache_dir / "manifest.json", 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
 def deploy_model(model_key: str, formats: List[str] = ["safetensors", "gguf_q4"], hf_token: Optional[str] = None):
     """Main deployment function."""
 
@@ -349,40 +573,59 @@ def deploy_model(model_key: str, formats: List[str] = ["safetensors", "gguf_q4"]
     try:
         # Step 1: Download base model (SafeTensors)
         base_dir = work_dir / "safetensors"
-        if "safetensors" in formats or any(fmt.startswith("gguf") for fmt in formats) or "mlx" in formats:
+        if "safetensors" in formats or any(fmt.startswith(("gguf", "mlx")) for fmt in formats):
             download_from_huggingface(model_info["hf_id"], base_dir, hf_token)
             format_paths["safetensors"] = base_dir
 
-        # Step 2: Create format variants
-        if any(fmt.startswith("gguf") for fmt in formats):
-            gguf_dir = work_dir / "gguf"
-            for fmt in formats:
-                if fmt.startswith("gguf_"):
-                    quant = fmt.replace("gguf_", "").upper()
-                    gguf_path = convert_to_gguf(base_dir, gguf_dir, quant)
-                    if gguf_path:
-                        format_paths[fmt] = gguf_path
-
-        if "mlx" in formats:
-            mlx_dir = work_dir / "mlx"
-            mlx_path = convert_to_mlx(base_dir, mlx_dir)
-            if mlx_path:
-                format_paths["mlx"] = mlx_path
-
-        # Step 3: Calculate hashes
-        print("\n🔐 Calculating hashes...")
-        for fmt, path in format_paths.items():
-            hash_val = calculate_hash(path)
+        # Step 2: Create format variants, reusing earlier conversions of the
+        # same SafeTensors bytes. Each converter runs in its own subprocess,
+        # so running them from threads uses separate cores.
+        converted = [fmt for fmt in formats if fmt in GGUF_QUANT_TYPES or fmt in MLX_QUANT_BITS]
+        if converted:
+            cache_dir = CONVERSION_CACHE_DIR / calculate_hash(base_dir)[:16]
+            manifest = load_conversion_manifest(cache_dir)
+
+            conversions = {}
+            for fmt in converted:
+                cached = manifest.get(fmt)
+                if cached and (cache_dir / cached).exists():
+                    print(f"\n♻️  Reusing cached {fmt}: {cache_dir / cached}")
+                    format_paths[fmt] = cache_dir / cached
+                elif fmt in GGUF_QUANT_TYPES:
+                    conversions[fmt] = (convert_to_gguf, base_dir, cache_dir / "gguf",
+                                        GGUF_QUANT_TYPES[fmt])
+                else:
+                    conversions[fmt] = (convert_to_mlx, base_dir, cache_dir / fmt,
+                                        MLX_QUANT_BITS[fmt])
+
+            if conversions:
+                with ThreadPoolExecutor(max_workers=len(conversions)) as ex:
+                    futures = {fmt: ex.submit(*args) for fmt, args in conversions.items()}
+                    for fmt, future in futures.items():
+                        path = future.result()
+                        if path:
+                            format_paths[fmt] = path
+                            manifest[fmt] = path.relative_to(cache_dir).as_posix()
+
+                # Only conversions that finished are recorded, so partial
+                # output from a failed run is never reused
+                save_conversion_manifest(cache_dir, manifest)
+
+            # Keep the requested format order for metadata and output
+            format_paths = {fmt: format_paths[fmt] for fmt in ["safetensors"] + formats
+                            if fmt in format_paths}
+
+        # Step 3: Upload to IPFS, hashing each format from the same read
+        print("\n📤 Uploading to IPFS and calculating hashes...")
+        with ThreadPoolExecutor(max_workers=max(1, len(format_paths))) as ex:
+            results = dict(zip(format_paths, ex.map(hash_and_upload, format_paths.values())))
+
+        for fmt, (cid, hash_val) in results.items():
+            format_cids[fmt] = cid
             format_hashes[fmt] = hash_val
             print(f"   {fmt}: {hash_val[:16]}...")
 
-        # Step 4: Upload to IPFS
-        print("\n📤 Uploading to IPFS...")
-        for fmt, path in format_paths.items():
-            cid = upload_to_ipfs(path)
-            format_cids[fmt] = cid
-
-        # Step 5: Create metadata
+        # Step 4: Create metadata
         metadata = create_model_metadata(model_key, model_info, format_cids, format_hashes)
 
         # Save metadata
@@ -436,7 +679,7 @@ def main():
         "--formats",
         nargs="+",
         default=["safetensors", "gguf_q4"],
-        choices=["safetensors", "gguf_q4", "gguf_q8", "mlx"],
+        choices=["safetensors", "gguf_q4", "gguf_q8", "mlx", "mlx_q8"],
         help="Formats to create (default: safetensors gguf_q4)",
     )
 
@@ -9,25 +9,92 @@ import json
 import os
 import subprocess
 import sys
+import gzip
 import hashlib
+import mmap
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tempfile
 import shutil
+import tarfile
+import threading
+import secrets
 
 try:
-    from web3 import Web3
-    import ipfshttpclient
+    from web3 import AsyncWeb3, Web3
 except ImportError as e:
     print(f"Missing dependency: {e}")
-    print("Install with: pip install web3 ipfshttpclient")
+    print("Install with: pip install web3")
     sys.exit(1)
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 # Default configuration
 DEFAULT_RPC = "http://localhost:8545"
 DEFAULT_IPFS = "/ip4/127.0.0.1/tcp/5001"
 
+# Archive compression for uploads; .mlpackage weights barely compress, so
+# the default is a plain tar
+COMPRESSION_CHOICES = ("none", "zstd", "gzip")
+DEFAULT_COMPRESSION = "none"
+
+# Post-conversion weight compression for CoreML packages
+QUANTIZE_CHOICES = ("none", "int8", "palettize4")
+DEFAULT_QUANTIZE = "none"
+
+# Query parameters for /api/v0/add: 1 MiB raw-leaf chunks, pinned in the
+# same request instead of a follow-up pin call
+IPFS_ADD_PARAMS = {
+    "cid-version": "1",
+    "raw-leaves": "true",
+    "chunker": "size-1048576",
+    "pin": "true",
+}
+
+# Read size for streaming uploads into the request body
+IPFS_UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Keep-alive pool shared by IPFS and RPC requests
+HTTP_POOL_SIZE = 16
+
+# Most registrations sent in one JSON-RPC batch
+MAX_REGISTER_BATCH = 100
+
+# Deployments already registered on-chain, keyed by model name and options
+DEPLOY_CACHE_PATH = Path.home() / ".citrate" / "deploy_cache.json"
+
+# Read size when hashing files that cannot be memory-mapped
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Model family substrings mapped to model_type, first match wins; the
+# original vit/resnet, clip and gpt/phi rules keep their precedence and newer
+# families only apply to names none of those match
+_TYPE_RULES = [(re.compile(pattern, re.I), model_type) for pattern, model_type in [
+    (r"vit|resnet", "vision"),
+    (r"clip", "multimodal"),
+    (r"gpt|phi", "generation"),
+    (r"convnext|efficientnet", "vision"),
+    (r"llama|mistral|qwen", "generation"),
+]]
+
 # Popular models optimized for Mac
 RECOMMENDED_MODELS = {
     "text": [
@@ -92,13 +159,39 @@ RECOMMENDED_MODELS = {
 class ModelImporter:
     """Import and deploy models to Citrate."""
     
-    def __init__(self, rpc_url: str = DEFAULT_RPC, ipfs_api: str = DEFAULT_IPFS):
+    def __init__(self, rpc_url: str = DEFAULT_RPC, ipfs_api: str = DEFAULT_IPFS,
+                 compress: str = DEFAULT_COMPRESSION, quantize: str = DEFAULT_QUANTIZE):
         self.rpc_url = rpc_url
         self.ipfs_api = ipfs_api
+        self.compress = compress
+        self.quantize = quantize
+        
+        if compress == "zstd" and zstandard is None:
+            print("zstd compression requires: pip install zstandard")
+            sys.exit(1)
+        
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # Uploads use httpx when installed, so HTTPS API endpoints can
+        # negotiate HTTP/2; otherwise they go through the shared session
+        self._upload_client = httpx.Client(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=HTTP_POOL_SIZE),
+            timeout=None,
+        ) if httpx is not None else None
         
         # Connect to IPFS
+        self.ipfs_api_http = _multiaddr_to_url(ipfs_api)
         try:
-            self.ipfs = ipfshttpclient.connect(ipfs_api)
+            response = self._session.post(f"{self.ipfs_api_http}/api/v0/version", timeout=5)
+            response.raise_for_status()
             print(f"Connected to IPFS at {ipfs_api}")
         except Exception as e:
             print(f"Failed to connect to IPFS: {e}")
@@ -107,7 +200,7 @@ class ModelImporter:
         
         # Connect to blockchain
         try:
-            self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+            self.w3 = Web3(Web3.HTTPProvider(rpc_url, session=self._session))
             if not self.w3.is_connected():
                 raise Exception("Not connected")
             print(f"Connected to Citrate at {rpc_url}")
@@ -115,11 +208,21 @@ class ModelImporter:
             print(f"Failed to connect to Citrate node: {e}")
             print("Make sure Citrate node is running")
             sys.exit(1)
+        
+        self.deploy_cache = self._load_deploy_cache()
     
     def import_from_huggingface(self, model_name: str, optimize_neural_engine: bool = False) -> Dict[str, Any]:
         """Import a model from HuggingFace."""
         print(f"\n🤖 Importing {model_name} from HuggingFace...")
         
+        cache_key = hashlib.sha256(
+            f"{model_name}|{optimize_neural_engine}|{self.quantize}".encode()
+        ).hexdigest()
+        cached = self.deploy_cache.get(cache_key)
+        if cached and self._is_registered(cached["model_id"]):
+            print(f"Already deployed as {cached['model_id']}, skipping conversion and upload")
+            return cached
+        
         with tempfile.TemporaryDirectory() as temp_dir:
             # Step 1: Convert to CoreML
             print("\n1️⃣ Converting to CoreML...")
@@ -139,14 +242,51 @@ class ModelImporter:
             
             # Step 4: Register on-chain
             print("\n4️⃣ Registering on blockchain...")
-            tx_hash = self._register_on_chain(metadata)
+            tx_hash, model_id = self._register_on_chain(metadata)
             
-            return {
+            result = {
                 "model_name": model_name,
+                "model_id": model_id,
                 "ipfs_cid": ipfs_cid,
                 "tx_hash": tx_hash,
                 "metadata": metadata,
             }
+        
+        self.deploy_cache[cache_key] = result
+        self._save_deploy_cache()
+        
+        return result
+    
+    def _load_deploy_cache(self) -> Dict[str, Any]:
+        """Load cached deployments, starting empty if the cache is missing or corrupt."""
+        try:
+            with open(DEPLOY_CACHE_PATH) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_deploy_cache(self) -> None:
+        """Persist cached deployments, replacing the file atomically."""
+        DEPLOY_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = DEPLOY_CACHE_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.deploy_cache, f, indent=2)
+        os.replace(tmp_path, DEPLOY_CACHE_PATH)
+    
+    def _is_registered(self, model_id: str) -> bool:
+        """Check that a cached model is still registered on-chain."""
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "citrate_getModel",
+            "params": [model_id.removeprefix("0x")],
+            "id": 1,
+        }
+        
+        try:
+            response = self._session.post(self.rpc_url, json=payload, timeout=10)
+            return response.json().get("result") is not None
+        except (requests.RequestException, ValueError):
+            return False
     
     def _convert_to_coreml(self, model_name: str, output_dir: str, optimize: bool) -> Path:
         """Convert model to CoreML format."""
@@ -161,71 +301,171 @@ class ModelImporter:
         if optimize:
             cmd.append("--optimize-neural-engine")
         
-        try:
-            result = subprocess.run(
-                cmd,
-                cwd=Path(__file__).parent,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            print(result.stdout)
-        except subprocess.CalledProcessError as e:
-            print(f"Conversion failed: {e.stderr}")
-            raise
+        # Echo converter output as it runs rather than after it exits
+        process = subprocess.Popen(
+            cmd,
+            cwd=Path(__file__).parent,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        with process.stdout:
+            for line in process.stdout:
+                sys.stdout.write(line)
+        
+        if process.wait() != 0:
+            print("Conversion failed")
+            raise subprocess.CalledProcessError(process.returncode, cmd)
         
         # Find the generated .mlpackage
+        # (the Neural Engine variant is written next to the base package)
         model_dir = Path(output_dir)
-        mlpackages = list(model_dir.glob("*.mlpackage"))
+        pattern = "*_neural_engine.mlpackage" if optimize else "*.mlpackage"
+        mlpackage = next(model_dir.glob(pattern), None)
         
-        if not mlpackages:
+        if mlpackage is None:
             raise FileNotFoundError("No .mlpackage file generated")
         
-        return mlpackages[0]
+        if self.quantize != "none":
+            return self._quantize_coreml(mlpackage)
+        return mlpackage
     
-    def _upload_to_ipfs(self, model_path: Path) -> str:
-        """Upload model to IPFS."""
-        # Create a tar archive of the model package
-        import tarfile
+    def _quantize_coreml(self, model_path: Path) -> Path:
+        """
+        Compress CoreML weights with int8 quantization or 4-bit palettization.
+        
+        convert_to_coreml.py targets macOS13, so only the per-channel int8 and
+        per-tensor palette granularities are available (per-block and grouped
+        channel need the iOS18/macOS15 opset).
+        """
+        import coremltools as ct
+        from coremltools.optimize.coreml import (
+            OpLinearQuantizerConfig,
+            OpPalettizerConfig,
+            OptimizationConfig,
+            linear_quantize_weights,
+            palettize_weights,
+        )
         
-        tar_path = model_path.parent / f"{model_path.stem}.tar.gz"
+        print(f"Applying {self.quantize} weight compression...")
+        model = ct.models.MLModel(str(model_path))
         
-        with tarfile.open(tar_path, "w:gz") as tar:
-            tar.add(model_path, arcname=model_path.name)
+        if self.quantize == "int8":
+            config = OptimizationConfig(global_config=OpLinearQuantizerConfig(
+                mode="linear_symmetric",
+                dtype="int8",
+                granularity="per_channel",
+            ))
+            compressed = linear_quantize_weights(model, config)
+        else:
+            config = OptimizationConfig(global_config=OpPalettizerConfig(
+                mode="kmeans",
+                nbits=4,
+                granularity="per_tensor",
+            ))
+            compressed = palettize_weights(model, config)
+        
+        output_path = model_path.with_name(f"{model_path.stem}_{self.quantize}.mlpackage")
+        compressed.save(str(output_path))
+        return output_path
+    
+    def _upload_to_ipfs(self, model_path: Path) -> str:
+        """Upload model to IPFS as a tar stream, without an intermediate archive."""
+        read_fd, write_fd = os.pipe()
+        errors = []
+        
+        def write_tar():
+            # Stream the archive into the pipe while ipfs.add consumes it
+            try:
+                with os.fdopen(write_fd, "wb") as pipe:
+                    if self.compress == "gzip":
+                        # Stream modes only take compresslevel from Python 3.12
+                        with gzip.GzipFile(fileobj=pipe, mode="wb", compresslevel=1) as gzpipe:
+                            with tarfile.open(fileobj=gzpipe, mode="w|") as tar:
+                                tar.add(model_path, arcname=model_path.name)
+                    elif self.compress == "zstd":
+                        compressor = zstandard.ZstdCompressor(level=1, threads=-1)
+                        with compressor.stream_writer(pipe, closefd=False) as zpipe:
+                            with tarfile.open(fileobj=zpipe, mode="w|") as tar:
+                                tar.add(model_path, arcname=model_path.name)
+                    else:
+                        with tarfile.open(fileobj=pipe, mode="w|") as tar:
+                            tar.add(model_path, arcname=model_path.name)
+            except Exception as e:
+                errors.append(e)
+        
+        writer = threading.Thread(target=write_tar, daemon=True)
+        writer.start()
+        
+        class ArchiveStream:
+            """Pipe reader that fails at EOF if the archive was not written completely."""
+            
+            def __init__(self, pipe):
+                self.pipe = pipe
+            
+            def read(self, size: int) -> bytes:
+                chunk = self.pipe.read(size)
+                if not chunk:
+                    writer.join()
+                    # Raising before the closing boundary aborts the add, so
+                    # a truncated archive is never stored or pinned
+                    if errors:
+                        raise errors[0]
+                return chunk
         
         # Upload to IPFS
-        result = self.ipfs.add(str(tar_path))
-        cid = result["Hash"]
+        with os.fdopen(read_fd, "rb") as pipe:
+            result = self._ipfs_add(ArchiveStream(pipe), model_path.name)
         
-        # Pin the content
-        self.ipfs.pin.add(cid)
+        cid = result["Hash"]
         
         print(f"Model uploaded to IPFS: {cid}")
         print(f"Size: {result['Size']} bytes")
         
         return cid
     
+    def _ipfs_add(self, stream, name: str) -> Dict[str, Any]:
+        """Add a stream to IPFS through the HTTP API, pinning it in the same call."""
+        boundary = secrets.token_hex(16)
+        
+        def body():
+            yield (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{name}"\r\n'
+                f"Content-Type: application/octet-stream\r\n\r\n"
+            ).encode()
+            for chunk in iter(lambda: stream.read(IPFS_UPLOAD_CHUNK_SIZE), b""):
+                yield chunk
+            yield f"\r\n--{boundary}--\r\n".encode()
+        
+        url = f"{self.ipfs_api_http}/api/v0/add"
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        
+        if self._upload_client is not None:
+            response = self._upload_client.post(
+                url, params=IPFS_ADD_PARAMS, content=body(), headers=headers
+            )
+        else:
+            response = self._session.post(
+                url, params=IPFS_ADD_PARAMS, data=body(), headers=headers
+            )
+        response.raise_for_status()
+        return response.json()
+    
     def _create_metadata(self, model_name: str, model_path: Path, ipfs_cid: str) -> Dict[str, Any]:
         """Create model metadata."""
         # Calculate model hash
-        hasher = hashlib.sha256()
-        with open(model_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
-        
-        model_hash = hasher.hexdigest()
+        model_hash = self._hash_model(model_path)
         
-        # Get file size
-        size_bytes = model_path.stat().st_size
+        # Get on-disk size, summing package contents for .mlpackage directories
+        if model_path.is_dir():
+            size_bytes = sum(p.stat().st_size for p in model_path.rglob("*") if p.is_file())
+        else:
+            size_bytes = model_path.stat().st_size
         
-        # Determine model type
-        model_type = "text"  # Default
-        if "vit" in model_name.lower() or "resnet" in model_name.lower():
-            model_type = "vision"
-        elif "clip" in model_name.lower():
-            model_type = "multimodal"
-        elif "gpt" in model_name.lower() or "phi" in model_name.lower():
-            model_type = "generation"
+        # Determine model type, defaulting to text
+        model_type = next((t for rule, t in _TYPE_RULES if rule.search(model_name)), "text")
         
         metadata = {
             "name": model_name,
@@ -245,30 +485,73 @@ class ModelImporter:
         
         return metadata
     
-    def _register_on_chain(self, metadata: Dict[str, Any]) -> str:
-        """Register model on Citrate blockchain."""
-        # Use Citrate RPC to deploy model
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "citrate_deployModel",
-            "params": [metadata],
-            "id": 1,
-        }
+    @staticmethod
+    def _hash_model(model_path: Path) -> str:
+        """SHA-256 of a model file, or of every file in a model package."""
+        hasher = hashlib.sha256()
         
-        response = requests.post(self.rpc_url, json=payload)
-        result = response.json()
+        if model_path.is_dir():
+            files = sorted(p for p in model_path.rglob("*") if p.is_file())
+        else:
+            files = [model_path]
+        
+        for path in files:
+            with open(path, "rb") as f:
+                try:
+                    # Hand hashlib the whole file as one buffer
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hasher.update(mm)
+                except ValueError:
+                    # Empty files cannot be mapped
+                    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                        hasher.update(chunk)
+        
+        return hasher.hexdigest()
+    
+    def _register_on_chain(self, metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """Register model on Citrate blockchain, returning (tx_hash, model_id)."""
+        # Use Citrate RPC to deploy model over web3's pooled connection
+        response = self.w3.provider.make_request("citrate_deployModel", [metadata])
+        return self._registration_result(response)
+    
+    def register_many(self, metadatas: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Register several models, returning (tx_hash, model_id) pairs.
+        
+        Registrations go out as JSON-RPC batches of up to MAX_REGISTER_BATCH calls.
+        """
+        if len(metadatas) == 1:
+            return [self._register_on_chain(metadatas[0])]
+        
+        results = []
+        for offset in range(0, len(metadatas), MAX_REGISTER_BATCH):
+            responses = self.w3.provider.make_batch_request([
+                ("citrate_deployModel", [metadata])
+                for metadata in metadatas[offset:offset + MAX_REGISTER_BATCH]
+            ])
+            
+            # A batch-level failure comes back as a single error object
+            if isinstance(responses, dict):
+                raise Exception(f"Registration failed: {responses.get('error')}")
+            
+            results.extend(self._registration_result(response) for response in responses)
         
-        if "error" in result:
-            raise Exception(f"Registration failed: {result['error']}")
+        return results
+    
+    @staticmethod
+    def _registration_result(response: Dict[str, Any]) -> Tuple[str, str]:
+        """Extract (tx_hash, model_id) from a citrate_deployModel response."""
+        if "error" in response:
+            raise Exception(f"Registration failed: {response['error']}")
         
-        tx_hash = result["result"]["transactionHash"]
-        model_id = result["result"]["modelId"]
+        tx_hash = response["result"]["transactionHash"]
+        model_id = response["result"]["modelId"]
         
         print(f"Model registered on-chain!")
         print(f"Transaction: {tx_hash}")
         print(f"Model ID: {model_id}")
         
-        return tx_hash
+        return tx_hash, model_id
     
     def list_recommended_models(self) -> None:
         """List recommended models for Mac."""
@@ -291,9 +574,9 @@ class ModelImporter:
         
         # Upload to IPFS
         print("Uploading to IPFS...")
-        result = self.ipfs.add(str(model_path))
+        with open(model_path, "rb") as f:
+            result = self._ipfs_add(f, model_path.name)
         ipfs_cid = result["Hash"]
-        self.ipfs.pin.add(ipfs_cid)
         
         # Load or create metadata
         if metadata_path and metadata_path.exists():
@@ -307,16 +590,63 @@ class ModelImporter:
             )
         
         # Register on-chain
-        tx_hash = self._register_on_chain(metadata)
+        tx_hash, model_id = self._register_on_chain(metadata)
         
         return {
             "model_file": str(model_path),
+            "model_id": model_id,
             "ipfs_cid": ipfs_cid,
             "tx_hash": tx_hash,
             "metadata": metadata,
         }
 
 
+class AsyncModelImporter:
+    """Issue Citrate model RPCs concurrently from one event loop."""
+    
+    def __init__(self, rpc_url: str = DEFAULT_RPC):
+        self.rpc_url = rpc_url
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+    
+    async def infer(self, model_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run inference on a deployed model and return its output."""
+        response = await self.w3.provider.make_request(
+            "citrate_runInference",
+            {"model_id": model_id, "input": input_data},
+        )
+        
+        if "error" in response:
+            raise Exception(f"Inference failed: {response['error']}")
+        
+        return response["result"]["output"]
+    
+    async def register(self, metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """Register model on Citrate blockchain, returning (tx_hash, model_id)."""
+        response = await self.w3.provider.make_request("citrate_deployModel", [metadata])
+        return ModelImporter._registration_result(response)
+    
+    async def aclose(self) -> None:
+        """Close the provider's HTTP session."""
+        # disconnect() is web3 7 API; older providers keep sessions in a
+        # module-level cache that is cleaned up at exit
+        disconnect = getattr(self.w3.provider, "disconnect", None)
+        if disconnect is not None:
+            await disconnect()
+
+
+def _multiaddr_to_url(addr: str) -> str:
+    """Turn an IPFS API multiaddr like /ip4/127.0.0.1/tcp/5001 into an HTTP URL."""
+    if not addr.startswith("/"):
+        return addr.rstrip("/")
+    
+    parts = addr.strip("/").split("/")
+    proto = "https" if "https" in parts else "http"
+    host, port = parts[1], parts[3]
+    if parts[0] == "ip6":
+        host = f"[{host}]"
+    return f"{proto}://{host}:{port}"
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Import and deploy AI models to Citrate blockchain"
@@ -342,6 +672,14 @@ def main():
         help="Path to metadata JSON",
     )
     
+    # Register many models at once
+    bulk_parser = subparsers.add_parser("bulk", help="Register models from a metadata list")
+    bulk_parser.add_argument(
+        "metadata",
+        type=Path,
+        help="Path to a JSON array of model metadata",
+    )
+    
     # List recommended models
     list_parser = subparsers.add_parser("list", help="List recommended models")
     
@@ -356,6 +694,18 @@ def main():
         default=DEFAULT_IPFS,
         help="IPFS API endpoint",
     )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSION_CHOICES,
+        default=DEFAULT_COMPRESSION,
+        help="Compression for uploaded model archives",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=QUANTIZE_CHOICES,
+        default=DEFAULT_QUANTIZE,
+        help="Compress CoreML weights after conversion",
+    )
     
     args = parser.parse_args()
     
@@ -364,7 +714,7 @@ def main():
         return
     
     # Initialize importer
-    importer = ModelImporter(args.rpc, args.ipfs)
+    importer = ModelImporter(args.rpc, args.ipfs, compress=args.compress, quantize=args.quantize)
     
     # Execute command
     if args.command == "list":
@@ -393,6 +743,18 @@ def main():
         
         print("\n✅ Model successfully deployed!")
         print(json.dumps(result, indent=2))
+    
+    elif args.command == "bulk":
+        with open(args.metadata) as f:
+            metadatas = json.load(f)
+        
+        registrations = importer.register_many(metadatas)
+        
+        print(f"\n✅ {len(registrations)} models successfully registered!")
+        print(json.dumps(
+            [{"tx_hash": tx_hash, "model_id": model_id} for tx_hash, model_id in registrations],
+            indent=2,
+        ))
 
 
 if __name__ == "__main__":